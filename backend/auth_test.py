@@ -13,8 +13,7 @@ os.environ['BETTER_AUTH_SECRET'] = 'test_secret_for_testing'
 from main import app
 from fastapi.testclient import TestClient
 from config.database import engine
-from models.user import User
-from models.todo import Task
+from utils.schema import ensure_schema
 from utils.security import verify_token
 from utils.auth import get_current_user
 from dependencies import get_current_user as dep_get_current_user
@@ -22,9 +21,8 @@ from jose import jwt
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-# Create the database tables
-User.metadata.create_all(bind=engine)
-Task.metadata.create_all(bind=engine)
+# Create the database tables (migrating an empty database)
+ensure_schema(engine)
 
 def run_auth_tests():
     """Run comprehensive tests for the authentication system"""
@@ -11,12 +11,10 @@ os.environ['DATABASE_URL'] = 'sqlite:///./basic_test.db'
 from main import app
 from fastapi.testclient import TestClient
 from config.database import engine
-from models.user import User
-from models.todo import Task
+from utils.schema import ensure_schema
 
-# Create the database tables
-User.metadata.create_all(bind=engine)
-Task.metadata.create_all(bind=engine)
+# Create the database tables (migrating an empty database)
+ensure_schema(engine)
 
 def run_basic_tests():
     """Run basic tests for the Task API"""
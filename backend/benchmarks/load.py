@@ -0,0 +1,326 @@
+"""
+Load-test harness: scripted workloads against the API, reporting throughput and latency
+percentiles, with JSON baselines to catch regressions.
+
+Run from the backend directory:
+
+    python -m benchmarks.load                                   # in-process app, throwaway SQLite db
+    python -m benchmarks.load --base-url http://localhost:8000  # a running server
+    python -m benchmarks.load --save benchmarks/baselines/local.json
+    python -m benchmarks.load --compare benchmarks/baselines/local.json
+
+Scenarios: auth (register/login storm, then refresh-token renewals), crud (mixed task CRUD per user) and pagination
+(walking a large task list with cursors and with deep offsets). --compare exits with
+status 1 when an operation's p95 or a scenario's throughput is worse than the baseline by
+more than --tolerance.
+"""
+
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+SCENARIOS = ("auth", "crud", "pagination")
+PASSWORD = "benchmark-password-1"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(timings: List[float], errors: int) -> Dict[str, Any]:
+    """
+    Latency summary (milliseconds) of one operation
+    """
+    ordered = sorted(timings)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+class Recorder:
+    """
+    Times every request of a scenario, per named operation
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, operation: str, method: str, url: str, expected: int = 200, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.timings[operation].append(time.perf_counter() - started)
+        if response.status_code != expected:
+            self.errors[operation] += 1
+        return response
+
+    def report(self, wall_seconds: float) -> Dict[str, Any]:
+        requests = sum(len(timings) for timings in self.timings.values())
+        return {
+            "wall_seconds": round(wall_seconds, 3),
+            "requests": requests,
+            "throughput_rps": round(requests / wall_seconds, 2) if wall_seconds else 0.0,
+            "errors": sum(self.errors.values()),
+            "operations": {
+                operation: summarize(timings, self.errors[operation])
+                for operation, timings in sorted(self.timings.items())
+            },
+        }
+
+
+async def gather_limited(concurrency: int, jobs: List[Callable[[], Any]]) -> None:
+    """
+    Run the job coroutines with at most concurrency of them in flight
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        async with semaphore:
+            await job()
+
+    await asyncio.gather(*(run(job) for job in jobs))
+
+
+async def register_user(client: httpx.AsyncClient) -> Dict[str, str]:
+    """
+    Untimed setup: a fresh user's authorization headers
+    """
+    response = await client.post(
+        "/api/auth/register", json={"email": f"bench-{uuid.uuid4().hex}@example.com", "password": PASSWORD}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['session']['accessToken']}"}
+
+
+async def auth_scenario(recorder: Recorder, options: argparse.Namespace) -> None:
+    """
+    Register/login storm: every user registers, then logs in --logins times and renews its
+    session as many times with refresh tokens
+    """
+    async def user_session():
+        email = f"bench-{uuid.uuid4().hex}@example.com"
+        credentials = {"email": email, "password": PASSWORD}
+        response = await recorder.request("register", "POST", "/api/auth/register", json=credentials)
+        for _ in range(options.logins):
+            response = await recorder.request("login", "POST", "/api/auth/login", json=credentials)
+        refresh_token = response.json()["session"]["refreshToken"] if response.status_code == 200 else None
+        for _ in range(options.logins if refresh_token else 0):
+            response = await recorder.request(
+                "refresh", "POST", "/api/auth/refresh", json={"refreshToken": refresh_token}
+            )
+            if response.status_code != 200:
+                break
+            refresh_token = response.json()["session"]["refreshToken"]
+
+    await gather_limited(options.concurrency, [user_session] * options.users)
+
+
+async def crud_scenario(recorder: Recorder, options: argparse.Namespace) -> None:
+    """
+    Mixed task CRUD: each user loops create, get, update, complete, list and delete
+    """
+    users = await asyncio.gather(*(register_user(recorder.client) for _ in range(options.users)))
+
+    async def user_session(headers):
+        for i in range(options.iterations):
+            task = (await recorder.request(
+                "create", "POST", "/api/tasks/", json={"title": f"Load {i}"}, headers=headers
+            )).json()
+            url = f"/api/tasks/{task['id']}"
+            await recorder.request("get", "GET", url, headers=headers)
+            await recorder.request("update", "PUT", url, json={"description": "updated"}, headers=headers)
+            await recorder.request("complete", "PATCH", f"{url}/complete", headers=headers)
+            await recorder.request("list", "GET", "/api/tasks/", params={"limit": 20}, headers=headers)
+            if i % 2:
+                await recorder.request("delete", "DELETE", url, headers=headers)
+
+    await gather_limited(options.concurrency, [lambda headers=headers: user_session(headers) for headers in users])
+
+
+async def pagination_scenario(recorder: Recorder, options: argparse.Namespace) -> None:
+    """
+    Deep pagination over one user's --tasks tasks: full walks by cursor and by offset (skip)
+    """
+    headers = await register_user(recorder.client)
+    for start in range(0, options.tasks, 500):
+        operations = [{"op": "create", "title": f"Page task {i}"} for i in range(start, min(start + 500, options.tasks))]
+        response = await recorder.client.post("/api/tasks/batch", json={"operations": operations}, headers=headers)
+        response.raise_for_status()
+
+    async def cursor_walk():
+        params = {"limit": options.page_size}
+        while True:
+            response = await recorder.request("page_cursor", "GET", "/api/tasks/", params=params, headers=headers)
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": options.page_size, "cursor": cursor}
+
+    async def offset_walk():
+        for skip in range(0, options.tasks, options.page_size):
+            await recorder.request(
+                "page_offset", "GET", "/api/tasks/", params={"limit": options.page_size, "skip": skip}, headers=headers
+            )
+
+    await gather_limited(options.concurrency, [cursor_walk] * options.walks + [offset_walk] * options.walks)
+
+
+SCENARIO_RUNNERS = {"auth": auth_scenario, "crud": crud_scenario, "pagination": pagination_scenario}
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str]) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Client for a running server, or for the app in this process (startup and shutdown hooks included)
+    """
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+            yield client
+        return
+
+    from main import app
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            yield client
+    finally:
+        await app.router.shutdown()
+
+
+async def run(options: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the selected scenarios one after another and collect their reports
+    """
+    results: Dict[str, Any] = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "target": options.base_url or "in-process",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {
+                key: value for key, value in vars(options).items() if key not in ("save", "compare", "base_url")
+            },
+        },
+        "scenarios": {},
+    }
+
+    async with open_client(options.base_url) as client:
+        for name in options.scenarios:
+            recorder = Recorder(client)
+            started = time.perf_counter()
+            await SCENARIO_RUNNERS[name](recorder, options)
+            results["scenarios"][name] = recorder.report(time.perf_counter() - started)
+
+    return results
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"{'scenario/operation':<24} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, scenario in results["scenarios"].items():
+        print(f"{name:<24} {scenario['requests']:>6} {scenario['errors']:>4}   "
+              f"{scenario['throughput_rps']:.1f} req/s over {scenario['wall_seconds']:.2f}s")
+        for operation, stats in scenario["operations"].items():
+            print(f"  {operation:<22} {stats['count']:>6} {stats['errors']:>4} {stats['p50_ms']:>9.2f} "
+                  f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regressions against a baseline: p95 latency up or throughput down by more than tolerance
+    """
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if scenario["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {scenario['throughput_rps']} req/s < baseline {base['throughput_rps']} req/s"
+            )
+        for operation, stats in scenario["operations"].items():
+            base_stats = base["operations"].get(operation)
+            if base_stats and stats["p95_ms"] > base_stats["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{name}/{operation}: p95 {stats['p95_ms']} ms > baseline {base_stats['p95_ms']} ms"
+                )
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--users", type=int, default=20, help="Users per auth/crud scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Simultaneous virtual users")
+    parser.add_argument("--logins", type=int, default=3, help="Logins per user (auth)")
+    parser.add_argument("--iterations", type=int, default=10, help="CRUD loops per user (crud)")
+    parser.add_argument("--tasks", type=int, default=2000, help="Tasks to page through (pagination)")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--walks", type=int, default=2, help="Full walks per paging style (pagination)")
+    parser.add_argument("--save", help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = parse_args(argv)
+
+    if not options.base_url:
+        if "DATABASE_URL" not in os.environ:
+            # Keep the in-process run off the development database
+            os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='task-bench-')}/bench.db"
+        # Every virtual user shares one client address - measure the endpoints, not the limiter
+        os.environ.setdefault("AUTH_RATE_LIMIT_ENABLED", "false")
+
+    results = asyncio.run(run(options))
+    print_report(results)
+
+    if options.save:
+        os.makedirs(os.path.dirname(os.path.abspath(options.save)), exist_ok=True)
+        with open(options.save, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Saved baseline to {options.save}")
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {options.compare} (tolerance {options.tolerance:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark: msgpack vs JSON for task pages - body size and encode/decode time.
+
+Run from the backend directory:
+
+    python -m benchmarks.msgpack_vs_json [--repeat 200]
+
+Pages are TaskResponse-shaped dicts with real UUID and datetime values, encoded the way
+the API does: orjson for JSON (what the read fast path uses), the stdlib json module for
+reference (what response_model routes use), and utils.negotiation.packb for msgpack.
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import json
+import statistics
+import time
+import uuid
+
+import orjson
+
+from utils.negotiation import packb, unpackb
+
+PAGE_SIZES = (1, 20, 100, 500)
+
+
+def make_page(rows: int) -> list:
+    """
+    A page of tasks with typical titles and descriptions
+    """
+    user_id = uuid.uuid4()
+    now = datetime.utcnow()
+    return [
+        {
+            "title": f"Task {i}: follow up with the team",
+            "description": "Short note about the task" if i % 2 else None,
+            "completed": i % 3 == 0,
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now - timedelta(seconds=i),
+        }
+        for i in range(rows)
+    ]
+
+
+def median_us(function, repeat: int) -> float:
+    """
+    Median wall time of one call in microseconds
+    """
+    function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(timings)
+
+
+def stdlib_dumps(page: list) -> bytes:
+    return json.dumps(page, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'rows':>5} {'format':<8} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for rows in PAGE_SIZES:
+        page = make_page(rows)
+        encoded = {"json": stdlib_dumps(page), "orjson": orjson.dumps(page), "msgpack": packb(page)}
+        codecs = {
+            "json": (lambda: stdlib_dumps(page), lambda: json.loads(encoded["json"])),
+            "orjson": (lambda: orjson.dumps(page), lambda: orjson.loads(encoded["orjson"])),
+            "msgpack": (lambda: packb(page), lambda: unpackb(encoded["msgpack"])),
+        }
+        for name, (encode, decode) in codecs.items():
+            print(
+                f"{rows:>5} {name:<8} {len(encoded[name]):>8} "
+                f"{median_us(encode, args.repeat):>10.1f} {median_us(decode, args.repeat):>10.1f}"
+            )
+        saved = 1 - len(encoded["msgpack"]) / len(encoded["orjson"])
+        print(f"{'':>5} msgpack is {saved:.0%} smaller than JSON")
+
+
+if __name__ == "__main__":
+    main()
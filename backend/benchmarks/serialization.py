@@ -0,0 +1,97 @@
+"""
+Micro-benchmark: task list page through the response_model path vs the orjson fast path.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization [--rows 100] [--repeat 200]
+
+Both paths read the same page from an in-memory SQLite database, so the timings cover
+row loading, validation and encoding - everything a GET /api/tasks/ spends CPU on after
+the query itself.
+"""
+
+from fastapi.routing import serialize_response
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_response_field
+from sqlmodel import Session, SQLModel, create_engine, select
+from typing import List
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from models.todo import Task, TaskResponse
+from models.user import User
+from utils.serialization import TASK_RESPONSE_COLUMNS, json_response, task_rows
+
+RESPONSE_FIELD = create_response_field("Response_get_tasks", List[TaskResponse])
+
+
+def response_model_page(session: Session, user_id: uuid.UUID, rows: int) -> bytes:
+    """
+    Current path: ORM entities, response_model validation, jsonable_encoder and json.dumps
+    """
+    tasks = session.exec(select(Task).where(Task.user_id == user_id).limit(rows)).all()
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=tasks))
+    return JSONResponse(content).body
+
+
+def fast_page(session: Session, user_id: uuid.UUID, rows: int) -> bytes:
+    """
+    Fast path: response columns only, plain dicts, orjson
+    """
+    result = session.exec(select(*TASK_RESPONSE_COLUMNS).where(Task.user_id == user_id).limit(rows))
+    return json_response(task_rows(result.all())).body
+
+
+def measure(label: str, page, session: Session, user_id: uuid.UUID, rows: int, repeat: int) -> float:
+    """
+    Time repeat calls of page, returning the median in milliseconds
+    """
+    page(session, user_id, rows)  # warm up statement caches
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        page(session, user_id, rows)
+        timings.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(timings)
+    print(f"{label:<16} median {median:7.3f} ms   p95 {sorted(timings)[int(repeat * 0.95) - 1]:7.3f} ms")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        user = User(email="bench@example.com", hashed_password="x")
+        session.add(user)
+        session.add_all(
+            Task(title=f"Task {i}", description="Benchmark task " * 8, completed=i % 3 == 0, user_id=user.id)
+            for i in range(args.rows)
+        )
+        session.commit()
+
+        assert asyncio.run(
+            serialize_response(
+                field=RESPONSE_FIELD,
+                response_content=session.exec(select(Task).where(Task.user_id == user.id)).all(),
+            )
+        ) == [
+            TaskResponse.model_validate(row).model_dump(mode="json")
+            for row in task_rows(session.exec(select(*TASK_RESPONSE_COLUMNS).where(Task.user_id == user.id)))
+        ]
+
+        print(f"{args.rows} tasks per page, {args.repeat} runs")
+        slow = measure("response_model", response_model_page, session, user.id, args.rows, args.repeat)
+        fast = measure("orjson fast path", fast_page, session, user.id, args.rows, args.repeat)
+        print(f"speed-up          {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
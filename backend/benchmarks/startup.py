@@ -0,0 +1,154 @@
+"""
+Cold-start benchmark: import time of the app and time to its first response, each run in a
+fresh interpreter (what a scaled-from-zero worker pays).
+
+Run from the backend directory:
+
+    python -m benchmarks.startup                # 5 boots against a throwaway SQLite db
+    python -m benchmarks.startup --runs 10 --top 15
+
+The first boot migrates the empty database; the others only check the schema revision.
+--top lists the slowest imports of one boot (python -X importtime).
+"""
+
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should stay unloaded until a request needs them
+DEFERRED_MODULES = ("jose", "passlib", "dotenv", "alembic")
+
+
+def boot() -> Dict[str, Any]:
+    """
+    Child process: import the app, run its startup hooks and serve one request
+    """
+    import httpx  # the benchmark's own client, kept out of the timings
+
+    started = time.perf_counter()
+    from main import app
+    imported = time.perf_counter()
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+
+    async def first_request():
+        await app.router.startup()
+        ready = time.perf_counter()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                response = await client.get("/health")
+                response.raise_for_status()
+            return ready, time.perf_counter()
+        finally:
+            await app.router.shutdown()
+
+    ready, responded = asyncio.run(first_request())
+    return {
+        "import_ms": round((imported - started) * 1000, 2),
+        "startup_ms": round((ready - imported) * 1000, 2),
+        "first_request_ms": round((responded - ready) * 1000, 2),
+        "total_ms": round((responded - started) * 1000, 2),
+        "deferred_loaded": loaded,
+    }
+
+
+def run_child(env: Dict[str, str], extra_args: Optional[List[str]] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *(extra_args or []), "-m", "benchmarks.startup", "--child"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure(runs: int, env: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Boot the app runs times, each in a new interpreter, timing the whole process too
+    """
+    boots = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = run_child(env)
+        boot_result = json.loads(result.stdout.strip().splitlines()[-1])
+        boot_result["process_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        boots.append(boot_result)
+    return boots
+
+
+def slowest_imports(env: Dict[str, str], top: int) -> List[tuple]:
+    """
+    (cumulative ms, module) of the slowest imports of one boot
+    """
+    stderr = run_child(env, ["-X", "importtime"]).stderr
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        timings.append((int(cumulative) / 1000, module.rstrip()))
+    return sorted(timings, reverse=True)[:top]
+
+
+def print_report(boots: List[Dict[str, Any]]) -> None:
+    columns = ("import_ms", "startup_ms", "first_request_ms", "total_ms", "process_ms")
+    print(f"{'boot':<10}" + "".join(f"{column:>18}" for column in columns))
+    for index, boot_result in enumerate(boots):
+        label = "migrate" if index == 0 else f"warm {index}"
+        print(f"{label:<10}" + "".join(f"{boot_result[column]:>18.2f}" for column in columns))
+    if len(boots) > 1:
+        warm = boots[1:]
+        print(f"{'median':<10}" + "".join(
+            f"{statistics.median(boot_result[column] for boot_result in warm):>18.2f}" for column in columns
+        ))
+
+    loaded = sorted({name for boot_result in boots for name in boot_result["deferred_loaded"]})
+    print(f"Deferred modules loaded by import: {', '.join(loaded) if loaded else 'none'}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Boots to measure (the first one migrates)")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports")
+    parser.add_argument("--json", action="store_true", help="Print the raw results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = parse_args(argv)
+
+    if options.child:
+        print(json.dumps(boot()))
+        return 0
+
+    env = dict(os.environ)
+    if "DATABASE_URL" not in env:
+        env["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='task-startup-')}/startup.db"
+
+    boots = measure(options.runs, env)
+    if options.json:
+        print(json.dumps(boots, indent=2))
+    else:
+        print_report(boots)
+
+    if options.top:
+        print("\nSlowest imports (cumulative ms):")
+        for cumulative, module in slowest_imports(env, options.top):
+            print(f"  {cumulative:>9.1f}  {module}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
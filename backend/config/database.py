@@ -1,16 +1,165 @@
 from sqlmodel import create_engine, Session
-from typing import Generator
-import os
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from typing import AsyncGenerator, Generator, List
+import itertools
 
-# Get database URL from environment - force SQLite for local development to avoid psycopg2 issues
-DATABASE_URL = "sqlite:///./local_dev.db"
+from config import settings
 
-# Create the database engine with SQLite
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,  # Set to True to see SQL queries in logs
-    connect_args={"check_same_thread": False}  # Required for SQLite
-)
+# Database URL from the environment - defaults to a local SQLite file for development
+DATABASE_URL = settings.DATABASE_URL
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Map a sync database URL onto the matching async driver
+    """
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+
+def is_sqlite_url(url: str) -> bool:
+    """
+    Check whether a database URL points at SQLite
+    """
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def get_engine_options(url: str) -> dict:
+    """
+    Build create_engine keyword arguments (pooling, timeouts) for a database URL
+    """
+    parsed = make_url(url)
+    options = {"echo": settings.DB_ECHO}
+
+    if parsed.get_backend_name() == "sqlite":
+        connect_args = {"check_same_thread": False}  # Required for SQLite
+
+        if parsed.database in (None, "", ":memory:"):
+            # In-memory databases only exist on a single connection
+            options["poolclass"] = StaticPool
+            options["connect_args"] = connect_args
+            return options
+
+        connect_args["timeout"] = settings.DB_CONNECT_TIMEOUT
+        options["connect_args"] = connect_args
+    elif parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"timeout": settings.DB_CONNECT_TIMEOUT}
+    elif parsed.get_backend_name() == "postgresql":
+        options["connect_args"] = {"connect_timeout": int(settings.DB_CONNECT_TIMEOUT)}
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection: WAL journaling, relaxed fsync, bigger page cache and mmap
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+    cursor.close()
+
+
+# Create the sync database engine (used for DDL and scripts)
+engine = create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
+
+if is_sqlite_url(DATABASE_URL):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
+
+def create_request_engine(url: str) -> AsyncEngine:
+    """
+    Async engine for the request path (aiosqlite locally, asyncpg on Postgres) from a sync URL
+    """
+    async_url = get_async_database_url(url)
+    request_engine = create_async_engine(async_url, **get_engine_options(async_url))
+
+    if is_sqlite_url(url):
+        event.listen(request_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+    return request_engine
+
+
+def create_session_factory(bind: AsyncEngine) -> async_sessionmaker:
+    """
+    Async session factory for an engine
+    """
+    # expire_on_commit=False so returned objects can be serialized after commit
+    # without triggering a lazy (blocking) refresh
+    return async_sessionmaker(bind, class_=AsyncSession, expire_on_commit=False)
+
+
+# Primary: every write, and reads that must see them
+async_engine = create_request_engine(DATABASE_URL)
+async_session_factory = create_session_factory(async_engine)
+
+# Read replicas (DATABASE_REPLICA_URLS), taken in turn by get_read_session_factory
+replica_engines: List[AsyncEngine] = [create_request_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+replica_session_factories: List[async_sessionmaker] = [create_session_factory(bind) for bind in replica_engines]
+_replica_turn = itertools.count()
+
+
+def get_read_session_factory() -> async_sessionmaker:
+    """
+    Session factory of the next replica in turn, or the primary's when there are no replicas
+    """
+    if not replica_session_factories:
+        return async_session_factory
+    return replica_session_factories[next(_replica_turn) % len(replica_session_factories)]
+
+
+def get_pool_status(pool) -> dict:
+    """
+    Snapshot the counters of a connection pool
+    """
+    status = {"pool": type(pool).__name__}
+
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            status[name] = counter()
+
+    return status
+
+
+def get_pool_stats() -> dict:
+    """
+    Connection pool statistics for the primary's engines and each replica's
+    """
+    return {
+        "sync": get_pool_status(engine.pool),
+        "async": get_pool_status(async_engine.pool),
+        **{f"replica_{index}": get_pool_status(bind.pool) for index, bind in enumerate(replica_engines)},
+        "configured": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        },
+    }
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -18,4 +167,13 @@ def get_session() -> Generator[Session, None, None]:
     Dependency to get a database session
     """
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session (on the primary)
+    """
+    async with async_session_factory() as session:
+        yield session
+
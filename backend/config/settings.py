@@ -0,0 +1,146 @@
+"""
+Application settings read from the environment (and a local .env file)
+"""
+
+from typing import Optional
+import os
+
+
+def find_env_file() -> Optional[str]:
+    """
+    Nearest .env file from the app directory upwards (where load_dotenv() would look)
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+# Load environment variables - python-dotenv is only imported when there is a file to read
+ENV_FILE = find_env_file()
+if ENV_FILE is not None:
+    from dotenv import load_dotenv
+
+    load_dotenv(ENV_FILE)
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Read an integer setting from the environment
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def env_float(name: str, default: float) -> float:
+    """
+    Read a float setting from the environment
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """
+    Read a boolean setting from the environment
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Database connection
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./local_dev.db")
+
+# Read replicas for the task read routes (comma-separated URLs in the DATABASE_URL format).
+# After a user's own write their reads stay on the primary for DB_READ_YOUR_WRITES_SECONDS,
+# which should exceed the replicas' lag.
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+DB_READ_YOUR_WRITES_SECONDS = env_float("DB_READ_YOUR_WRITES_SECONDS", 5.0)
+DB_READ_YOUR_WRITES_CACHE_SIZE = env_int("DB_READ_YOUR_WRITES_CACHE_SIZE", 100000)
+DB_ECHO = env_bool("DB_ECHO", False)
+
+# Startup schema check against the expected migration revision: "upgrade" migrates an empty
+# or outdated database, "verify" refuses to start, "off" skips it (migrations run elsewhere)
+DB_SCHEMA_CHECK = os.getenv("DB_SCHEMA_CHECK", "upgrade").strip().lower()
+
+# Connection pool (ignored for in-memory SQLite, which uses a static pool)
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT = env_float("DB_POOL_TIMEOUT", 30.0)  # seconds to wait for a free connection
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)  # seconds before a connection is replaced
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_CONNECT_TIMEOUT = env_float("DB_CONNECT_TIMEOUT", 10.0)  # seconds to establish a connection
+
+# SQLite pragmas applied to every new connection
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE = env_int("SQLITE_CACHE_SIZE", -64000)  # negative values are KiB (64 MiB)
+SQLITE_MMAP_SIZE = env_int("SQLITE_MMAP_SIZE", 268435456)  # 256 MiB
+SQLITE_BUSY_TIMEOUT = env_int("SQLITE_BUSY_TIMEOUT", 5000)  # milliseconds
+
+# Authenticated user (principal) cache
+USER_CACHE_SIZE = env_int("USER_CACHE_SIZE", 10000)
+USER_CACHE_TTL_SECONDS = env_float("USER_CACHE_TTL_SECONDS", 60.0)
+
+# Token lifetimes: short access tokens, renewed with rotating refresh tokens
+ACCESS_TOKEN_EXPIRE_MINUTES = env_float("ACCESS_TOKEN_EXPIRE_MINUTES", 30.0)
+REFRESH_TOKEN_EXPIRE_DAYS = env_float("REFRESH_TOKEN_EXPIRE_DAYS", 30.0)
+REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS = env_float("REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS", 3600.0)
+
+# Task routes authorize from the access token alone (no user row), checking its "ver"
+# claim against cached token versions; deleted users and revocations are still seen
+AUTH_TOKEN_ONLY = env_bool("AUTH_TOKEN_ONLY", True)
+TOKEN_VERSION_CACHE_SIZE = env_int("TOKEN_VERSION_CACHE_SIZE", 100000)
+TOKEN_VERSION_CACHE_TTL_SECONDS = env_float("TOKEN_VERSION_CACHE_TTL_SECONDS", 300.0)
+
+# Verified JWT cache (entries never outlive the token's exp claim)
+TOKEN_CACHE_SIZE = env_int("TOKEN_CACHE_SIZE", 10000)
+TOKEN_CACHE_TTL_SECONDS = env_float("TOKEN_CACHE_TTL_SECONDS", 1800.0)
+
+# Password hashing pool (bcrypt runs in separate processes; 0 keeps it in-process)
+HASH_WORKERS = env_int("HASH_WORKERS", min(2, os.cpu_count() or 1))
+HASH_MAX_PENDING = env_int("HASH_MAX_PENDING", 64)  # queued + running hashes before 503
+HASH_TIMEOUT_SECONDS = env_float("HASH_TIMEOUT_SECONDS", 10.0)
+
+# Task batch endpoint
+TASK_BATCH_MAX_OPERATIONS = env_int("TASK_BATCH_MAX_OPERATIONS", 500)
+
+# Server-Sent Events change feed
+SSE_QUEUE_SIZE = env_int("SSE_QUEUE_SIZE", 100)  # undelivered events per stream before a resync
+SSE_HEARTBEAT_SECONDS = env_float("SSE_HEARTBEAT_SECONDS", 15.0)
+
+# Delta sync: deleted-task tombstones are kept this long, then compacted
+TOMBSTONE_RETENTION_DAYS = env_float("TOMBSTONE_RETENTION_DAYS", 30.0)
+TOMBSTONE_COMPACT_INTERVAL_SECONDS = env_float("TOMBSTONE_COMPACT_INTERVAL_SECONDS", 3600.0)
+TASK_CHANGES_PAGE_SIZE = env_int("TASK_CHANGES_PAGE_SIZE", 500)
+
+# Task export: rows fetched per round trip from the streaming cursor
+TASK_EXPORT_BATCH_SIZE = env_int("TASK_EXPORT_BATCH_SIZE", 1000)
+
+# Task import: rows per multi-row INSERT (and commit), longest accepted line, errors reported
+TASK_IMPORT_CHUNK_SIZE = env_int("TASK_IMPORT_CHUNK_SIZE", 500)
+TASK_IMPORT_MAX_LINE_LENGTH = env_int("TASK_IMPORT_MAX_LINE_LENGTH", 65536)
+TASK_IMPORT_MAX_ERRORS = env_int("TASK_IMPORT_MAX_ERRORS", 100)
+
+# Prometheus metrics on /metrics
+METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+
+# Auth rate limiting: token buckets per client IP and per email, checked before bcrypt
+AUTH_RATE_LIMIT_ENABLED = env_bool("AUTH_RATE_LIMIT_ENABLED", True)
+AUTH_RATE_LIMIT_IP_PER_MINUTE = env_float("AUTH_RATE_LIMIT_IP_PER_MINUTE", 60.0)
+AUTH_RATE_LIMIT_IP_BURST = env_float("AUTH_RATE_LIMIT_IP_BURST", 60.0)
+AUTH_RATE_LIMIT_EMAIL_PER_MINUTE = env_float("AUTH_RATE_LIMIT_EMAIL_PER_MINUTE", 6.0)
+AUTH_RATE_LIMIT_EMAIL_BURST = env_float("AUTH_RATE_LIMIT_EMAIL_BURST", 6.0)
+AUTH_RATE_LIMIT_STORE_SIZE = env_int("AUTH_RATE_LIMIT_STORE_SIZE", 100000)  # buckets kept in memory
+AUTH_RATE_LIMIT_TRUST_PROXY = env_bool("AUTH_RATE_LIMIT_TRUST_PROXY", False)  # use X-Forwarded-For
@@ -0,0 +1,10 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client whose startup hooks (schema check, background loops) run once for the whole session"""
+    with TestClient(app) as client:
+        yield client
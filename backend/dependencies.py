@@ -1,9 +1,14 @@
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session
-from config.database import get_session
-from utils.auth import get_current_user, get_current_user_from_token
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import AsyncGenerator
+from config import settings
+from config.database import async_session_factory, get_read_session_factory, get_session
+from utils.auth import get_current_user, get_current_user_from_token, get_token_user
 from utils.jwt import get_user_id_as_uuid
 from models.user import User
+from schemas.auth import AuthenticatedUser
+from utils.read_routing import wrote_recently
 
 
 def get_db_session():
@@ -33,4 +38,27 @@ def get_current_user_uuid(user_uuid: str = Depends(get_user_id_as_uuid)) -> str:
     """
     Get current user UUID from token dependency
     """
-    return user_uuid
\ No newline at end of file
+    return user_uuid
+
+
+def get_user_row_identity(current_user: User = Depends(get_current_user)) -> AuthenticatedUser:
+    """
+    Task route identity read from the user row (AUTH_TOKEN_ONLY=false)
+    """
+    return AuthenticatedUser(id=current_user.id)
+
+
+# Identity for the task routes: from the access token alone unless AUTH_TOKEN_ONLY is off
+get_task_user = get_token_user if settings.AUTH_TOKEN_ONLY else get_user_row_identity
+
+
+async def get_task_read_session(
+    current_user: AuthenticatedUser = Depends(get_task_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for the task read routes: a read replica, or the primary while the user's own
+    recent write may not have replicated yet
+    """
+    factory = async_session_factory if wrote_recently(current_user.id) else get_read_session_factory()
+    async with factory() as session:
+        yield session
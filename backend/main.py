@@ -1,9 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from routers import auth, tasks
-from config.database import engine
-from models.user import User
-from models.todo import Task
+from config.database import async_engine, engine, get_pool_stats, replica_engines
+from utils.auth import token_versions, user_cache
+from utils.hashing import password_hasher
+from utils.security import token_cache
+from utils.events import task_events
+from utils.background import run_periodically
+from utils.task_state import compact_expired_tombstones
+from utils.refresh_tokens import prune_expired_refresh_tokens
+from utils.metrics import CONTENT_TYPE, Gauge, instrument_engine, instrument_routes, registry
+from utils.schema import ensure_schema
+from config import settings
+from datetime import timedelta
+from functools import partial
+import asyncio
 
 
 # Create the FastAPI app
@@ -21,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
@@ -31,11 +44,37 @@ app.include_router(tasks.router)
 
 @app.on_event("startup")
 def on_startup():
-    """Create database tables on startup"""
-    print("Creating database tables...")
-    User.metadata.create_all(bind=engine)
-    Task.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    """Check the schema revision (migrating an empty database in "upgrade" mode) and start the hashing pool"""
+    ensure_schema(engine)
+    password_hasher.start()
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    """Start periodic maintenance (tombstone compaction, expired refresh token pruning)"""
+    app.state.tombstone_compaction = asyncio.create_task(
+        run_periodically(
+            partial(compact_expired_tombstones, timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)),
+            settings.TOMBSTONE_COMPACT_INTERVAL_SECONDS,
+            "Tombstone compaction",
+        )
+    )
+    app.state.refresh_token_pruning = asyncio.create_task(
+        run_periodically(
+            prune_expired_refresh_tokens,
+            settings.REFRESH_TOKEN_PRUNE_INTERVAL_SECONDS,
+            "Refresh token pruning",
+        )
+    )
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Stop background jobs and the password hashing pool, and end open event streams"""
+    app.state.tombstone_compaction.cancel()
+    app.state.refresh_token_pruning.cancel()
+    password_hasher.shutdown()
+    await task_events.close()
 
 
 @app.get("/")
@@ -51,4 +90,65 @@ def health_check():
     """
     Health check endpoint
     """
-    return {"status": "healthy", "service": "task-api"}
\ No newline at end of file
+    return {"status": "healthy", "service": "task-api"}
+
+
+@app.get("/health/db")
+def database_health():
+    """
+    Connection pool statistics for sizing workers
+    """
+    return get_pool_stats()
+
+
+@app.get("/health/cache")
+def cache_health():
+    """
+    Hit/miss counters for the in-process caches
+    """
+    return {
+        "users": user_cache.stats(),
+        "tokens": token_cache.stats(),
+        "token_versions": token_versions.stats(),
+        "password_hashing": password_hasher.stats(),
+    }
+
+
+def pool_gauge_samples():
+    """
+    Connection counts of both pools, by state
+    """
+    for name, status in get_pool_stats().items():
+        for state in ("size", "checkedin", "checkedout", "overflow"):
+            if state in status:
+                yield (name, state), status[state]
+
+
+def hashing_gauge_samples():
+    """
+    Password hashing pool queue depth
+    """
+    yield (), password_hasher.stats()["pending"]
+
+
+if settings.METRICS_ENABLED:
+    registry.register(Gauge(
+        "db_pool_connections", "Database pool connections by state", ("engine", "state"), collect=pool_gauge_samples,
+    ))
+    registry.register(Gauge(
+        "password_hash_pending", "Hashes queued or running on the hashing pool", collect=hashing_gauge_samples,
+    ))
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """
+        Prometheus scrape endpoint
+        """
+        return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+    # Instrument last, once every route exists
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    for replica_engine in replica_engines:
+        instrument_engine(replica_engine.sync_engine)
+    instrument_routes(app.routes)
@@ -0,0 +1,84 @@
+"""
+Alembic environment - migrates the database behind DATABASE_URL
+"""
+
+from alembic import context
+from logging.config import fileConfig
+from sqlalchemy import engine_from_config, pool
+from sqlmodel import SQLModel
+
+from config import settings
+from models.user import User  # noqa: F401 - register tables on the metadata
+from models.todo import Task  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+
+def get_url() -> str:
+    """
+    The database to migrate: sqlalchemy.url when set, otherwise DATABASE_URL
+    """
+    return config.get_main_option("sqlalchemy.url") or settings.DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """
+    Emit the migration SQL without connecting (alembic upgrade head --sql)
+    """
+    url = get_url()
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=url.startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """
+    Run the migrations against a live connection
+    """
+    # The app's startup schema check hands over its own connection
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations_on(connection)
+        return
+
+    connectable = engine_from_config(
+        {"sqlalchemy.url": get_url()},
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        run_migrations_on(connection)
+
+
+def run_migrations_on(connection) -> None:
+    """
+    Run the migrations on an open connection
+    """
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite cannot ALTER most things in place - let Alembic copy the table instead
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
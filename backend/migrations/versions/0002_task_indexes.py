@@ -0,0 +1,30 @@
+"""index task by owner for the per-user list and lookup queries
+
+Revision ID: 0002_task_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_task_indexes"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matches ORDER BY created_at DESC, id DESC in GET /api/tasks (keyset pagination),
+    # and serves every other user_id filter through its leading column
+    op.create_index(
+        "ix_task_user_id_created_at_id",
+        "task",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index("ix_task_user_id_completed", "task", ["user_id", "completed"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_user_id_completed", table_name="task")
+    op.drop_index("ix_task_user_id_created_at_id", table_name="task")
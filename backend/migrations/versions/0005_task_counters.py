@@ -0,0 +1,39 @@
+"""per-user task counters on usertaskstate
+
+Revision ID: 0005_task_counters
+Revises: 0004_task_search
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_task_counters"
+down_revision = "0004_task_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("usertaskstate") as batch_op:
+        batch_op.add_column(sa.Column("task_count", sa.Integer(), nullable=False, server_default="0"))
+        batch_op.add_column(sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"))
+
+    # Every user gets a state row, then the counters are backfilled from the task table
+    op.execute(
+        'INSERT INTO usertaskstate (user_id, version, task_count, completed_count, updated_at) '
+        'SELECT id, 0, 0, 0, CURRENT_TIMESTAMP FROM "user" '
+        'WHERE id NOT IN (SELECT user_id FROM usertaskstate)'
+    )
+    op.execute(
+        "UPDATE usertaskstate SET "
+        "task_count = (SELECT count(*) FROM task WHERE task.user_id = usertaskstate.user_id), "
+        "completed_count = (SELECT count(*) FROM task WHERE task.user_id = usertaskstate.user_id "
+        "AND task.completed)"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("usertaskstate") as batch_op:
+        batch_op.drop_column("completed_count")
+        batch_op.drop_column("task_count")
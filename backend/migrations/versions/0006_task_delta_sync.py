@@ -0,0 +1,50 @@
+"""change sequence on task and tombstones for delta sync
+
+Revision ID: 0006_task_delta_sync
+Revises: 0005_task_counters
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = "0006_task_delta_sync"
+down_revision = "0005_task_counters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing tasks start at 0, so only a full sync (no cursor) returns them
+    with op.batch_alter_table("task") as batch_op:
+        batch_op.add_column(sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"))
+    op.create_index("ix_task_user_id_change_seq", "task", ["user_id", "change_seq"])
+
+    with op.batch_alter_table("usertaskstate") as batch_op:
+        batch_op.add_column(sa.Column("tombstone_floor", sa.Integer(), nullable=False, server_default="0"))
+
+    op.create_table(
+        "tasktombstone",
+        sa.Column("task_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("user_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    op.create_index("ix_tasktombstone_deleted_at", "tasktombstone", ["deleted_at"])
+    op.create_index("ix_tasktombstone_user_id_change_seq", "tasktombstone", ["user_id", "change_seq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasktombstone_user_id_change_seq", table_name="tasktombstone")
+    op.drop_index("ix_tasktombstone_deleted_at", table_name="tasktombstone")
+    op.drop_table("tasktombstone")
+
+    with op.batch_alter_table("usertaskstate") as batch_op:
+        batch_op.drop_column("tombstone_floor")
+
+    op.drop_index("ix_task_user_id_change_seq", table_name="task")
+    with op.batch_alter_table("task") as batch_op:
+        batch_op.drop_column("change_seq")
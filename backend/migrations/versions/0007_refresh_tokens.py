@@ -0,0 +1,39 @@
+"""refresh tokens
+
+Revision ID: 0007_refresh_tokens
+Revises: 0006_task_delta_sync
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+revision = "0007_refresh_tokens"
+down_revision = "0006_task_delta_sync"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "refreshtoken",
+        sa.Column("id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("user_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("family_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_refreshtoken_user_id", "refreshtoken", ["user_id"])
+    op.create_index("ix_refreshtoken_family_id", "refreshtoken", ["family_id"])
+    op.create_index("ix_refreshtoken_expires_at", "refreshtoken", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refreshtoken_expires_at", table_name="refreshtoken")
+    op.drop_index("ix_refreshtoken_family_id", table_name="refreshtoken")
+    op.drop_index("ix_refreshtoken_user_id", table_name="refreshtoken")
+    op.drop_table("refreshtoken")
@@ -0,0 +1,25 @@
+"""token version on user for access token revocation
+
+Revision ID: 0008_user_token_version
+Revises: 0007_refresh_tokens
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_user_token_version"
+down_revision = "0007_refresh_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tokens issued before this revision carry no "ver" claim and are read as version 0
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.add_column(sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("token_version")
@@ -0,0 +1,32 @@
+"""delta-sync indexes ordered by (change_seq, id) for paging within one version
+
+Revision ID: 0009_change_seq_id_indexes
+Revises: 0008_user_token_version
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+
+revision = "0009_change_seq_id_indexes"
+down_revision = "0008_user_token_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every task that predates 0006 shares change_seq 0, so pages break ties by id
+    op.drop_index("ix_task_user_id_change_seq", table_name="task")
+    op.create_index("ix_task_user_id_change_seq_id", "task", ["user_id", "change_seq", "id"])
+
+    op.drop_index("ix_tasktombstone_user_id_change_seq", table_name="tasktombstone")
+    op.create_index(
+        "ix_tasktombstone_user_id_change_seq_task_id", "tasktombstone", ["user_id", "change_seq", "task_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasktombstone_user_id_change_seq_task_id", table_name="tasktombstone")
+    op.create_index("ix_tasktombstone_user_id_change_seq", "tasktombstone", ["user_id", "change_seq"])
+
+    op.drop_index("ix_task_user_id_change_seq_id", table_name="task")
+    op.create_index("ix_task_user_id_change_seq", "task", ["user_id", "change_seq"])
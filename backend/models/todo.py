@@ -1,6 +1,7 @@
+from sqlalchemy import DDL, Index, event
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime
-from typing import Optional
+from typing import List, Literal, Optional
 import uuid
 from models.user import User
 
@@ -20,13 +21,85 @@ class Task(TaskBase, table=True):
     user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
 
     # Timestamps
-    created_at: datetime = Field(default=datetime.utcnow(), nullable=False)
-    updated_at: datetime = Field(default=datetime.utcnow(), nullable=False)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+    # Owner's task version at the last write (see UserTaskState.version) - drives delta sync
+    change_seq: int = Field(default=0, nullable=False)
 
     # Relationship to user
     user: User = Relationship(back_populates="tasks")
 
 
+# Per-user indexes (kept in step with migrations/versions/0002_task_indexes.py)
+Index("ix_task_user_id_created_at_id", Task.user_id, Task.created_at.desc(), Task.id.desc())
+Index("ix_task_user_id_completed", Task.user_id, Task.completed)
+Index("ix_task_user_id_change_seq_id", Task.user_id, Task.change_seq, Task.id)
+
+
+# Full-text search structures (kept in step with migrations/versions/0004_task_search.py).
+# SQLite: an external-content FTS5 table over task.rowid, maintained by triggers. VACUUM may
+# renumber rowids, so run INSERT INTO task_fts(task_fts) VALUES('rebuild') after one.
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "title, description, content='task', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ai AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_ad AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_au AFTER UPDATE OF title, description ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO task_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description); END",
+]
+
+# Postgres: a generated tsvector column with a GIN index
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE task ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS "
+    "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_task_search_vector ON task USING gin (search_vector)",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
+class UserTaskState(SQLModel, table=True):
+    """Per-user task bookkeeping, written in the same transaction as the user's task writes"""
+    user_id: uuid.UUID = Field(foreign_key="user.id", primary_key=True)
+
+    # Bumped on every create/update/complete/delete - backs the task list ETag
+    version: int = Field(default=0, nullable=False)
+
+    # Task counters, adjusted by the same statement that bumps version
+    task_count: int = Field(default=0, nullable=False)
+    completed_count: int = Field(default=0, nullable=False)
+
+    # Tombstones up to this version may have been compacted - older sync cursors must reset
+    tombstone_floor: int = Field(default=0, nullable=False)
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class TaskTombstone(SQLModel, table=True):
+    """Marker left behind by a deleted task, kept for the delta-sync retention window"""
+    task_id: uuid.UUID = Field(primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
+    change_seq: int = Field(nullable=False)
+    deleted_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
+
+
+Index(
+    "ix_tasktombstone_user_id_change_seq_task_id",
+    TaskTombstone.user_id,
+    TaskTombstone.change_seq,
+    TaskTombstone.task_id,
+)
+
+
 class TaskCreate(TaskBase):
     """Schema for creating a new task"""
     title: str
@@ -48,4 +121,65 @@ class TaskResponse(TaskBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TaskStats(SQLModel):
+    """Schema for returning a user's task counts"""
+    total: int
+    completed: int
+    open: int
+
+
+class TaskChanges(SQLModel):
+    """Schema for returning the tasks changed since a sync cursor"""
+    tasks: List[TaskResponse]  # created or modified
+    deleted: List[uuid.UUID]
+    cursor: str  # pass back as ?since= to continue
+    has_more: bool
+    reset: bool = False  # cursor too old - discard local state and sync from scratch
+
+
+class TaskBatchOperation(SQLModel):
+    """One create/update/delete/complete step of a batch request"""
+    op: Literal["create", "update", "delete", "complete"]
+    id: Optional[uuid.UUID] = None  # required for everything but create
+    title: Optional[str] = None
+    description: Optional[str] = None
+    completed: Optional[bool] = None  # for complete: omit to toggle
+
+
+class TaskBatchRequest(SQLModel):
+    """Schema for a batch of task operations"""
+    operations: List[TaskBatchOperation]
+
+
+class TaskBatchResult(SQLModel):
+    """Outcome of one batch operation, in request order"""
+    index: int
+    op: str
+    status: int
+    id: Optional[uuid.UUID] = None
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(SQLModel):
+    """Schema for returning batch results"""
+    results: List[TaskBatchResult]
+    succeeded: int
+    failed: int
+
+
+class TaskImportError(SQLModel):
+    """A rejected import row (row numbers count data rows, from 1)"""
+    row: int
+    error: str
+
+
+class TaskImportResponse(SQLModel):
+    """Schema for returning import results"""
+    imported: int
+    failed: int
+    errors: List[TaskImportError]  # the first TASK_IMPORT_MAX_ERRORS rejected rows
+    aborted: Optional[str] = None  # set when the upload could not be read to the end
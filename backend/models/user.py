@@ -18,6 +18,9 @@ class User(UserBase, table=True):
     email: str = Field(unique=True, nullable=False, max_length=255, index=True)
     hashed_password: str = Field(nullable=False)
 
+    # Stamped on access tokens as the "ver" claim; bumping it revokes every issued token
+    token_version: int = Field(default=0, nullable=False)
+
     # Timestamps
     created_at: datetime = Field(default=datetime.utcnow(), nullable=False)
     updated_at: datetime = Field(default=datetime.utcnow(), nullable=False)
@@ -26,6 +29,19 @@ class User(UserBase, table=True):
     tasks: list["Task"] = Relationship(back_populates="user")
 
 
+class RefreshToken(SQLModel, table=True):
+    """Issued refresh token, keyed by its jti; rotated tokens stay revoked to expose reuse"""
+    id: uuid.UUID = Field(primary_key=True)
+    user_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, index=True)
+
+    # Every rotation of one login shares a family - replaying a rotated token revokes it all
+    family_id: uuid.UUID = Field(nullable=False, index=True)
+
+    expires_at: datetime = Field(nullable=False, index=True)
+    revoked_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
 class UserCreate(UserBase):
     """Schema for creating a new user"""
     email: str
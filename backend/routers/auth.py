@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import timedelta
 from pydantic import BaseModel
+from typing import Optional
+from uuid import UUID
 
 from models.user import User, UserCreate
-from config.database import get_session
+from config import settings
+from config.database import get_async_session
 from dependencies import get_current_user
 from utils.auth import get_current_user_from_token
-from utils.auth import authenticate_user
-from utils.security import create_access_token, get_password_hash
+from utils.auth import authenticate_user, get_token_version, revoke_user_tokens
+from utils.hashing import get_password_hash_async
+from utils.rate_limit import auth_rate_limiter
+from utils.refresh_tokens import REFRESH_TOKEN_EXPIRES, issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+from utils.security import create_access_token
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
@@ -17,13 +24,41 @@ class UserLogin(BaseModel):
     email: str
     password: str
 
+class RefreshRequest(BaseModel):
+    refreshToken: str
+
+class LogoutRequest(BaseModel):
+    refreshToken: Optional[str] = None
+
+
+def build_session(user_id: UUID, token_version: int, refresh_token: str) -> dict:
+    """
+    Session payload: a fresh access token plus the refresh token that renews it
+    """
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": str(user_id), "ver": token_version}, expires_delta=access_token_expires
+    )
+
+    return {
+        "accessToken": access_token,
+        "expiresAt": access_token_expires.total_seconds(),
+        "refreshToken": refresh_token,
+        "refreshExpiresAt": REFRESH_TOKEN_EXPIRES.total_seconds(),
+    }
+
+
 @router.post("/register")
-def register(user: UserCreate, session: Session = Depends(get_session)):
+async def register(request: Request, user: UserCreate, session: AsyncSession = Depends(get_async_session)):
     """
     Register a new user
     """
+    # Throttle before any database or bcrypt work
+    await auth_rate_limiter.check(request, user.email)
+
     # Check if user already exists
-    existing_user = session.query(User).filter(User.email == user.email).first()
+    result = await session.exec(select(User).where(User.email == user.email))
+    existing_user = result.first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -38,39 +73,35 @@ def register(user: UserCreate, session: Session = Depends(get_session)):
         )
 
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password
     )
 
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
-
-    # Create access token for the new user
-    access_token_expires = timedelta(minutes=30)  # 30 minutes expiry
-    access_token = create_access_token(
-        data={"sub": str(db_user.id)}, expires_delta=access_token_expires
-    )
+    await session.flush()
+    refresh_token = issue_refresh_token(session, db_user.id)
+    await session.commit()
+    await session.refresh(db_user)
 
     return {
         "user": {
             "id": str(db_user.id),
             "email": db_user.email,
         },
-        "session": {
-            "accessToken": access_token,
-            "expiresAt": access_token_expires.total_seconds()
-        }
+        "session": build_session(db_user.id, db_user.token_version, refresh_token)
     }
 
 
 @router.post("/login")
-def login(user_credentials: UserLogin, session: Session = Depends(get_session)):
+async def login(request: Request, user_credentials: UserLogin, session: AsyncSession = Depends(get_async_session)):
     """
     Login user and return access token
     """
+    # Throttle before any database or bcrypt work
+    await auth_rate_limiter.check(request, user_credentials.email)
+
     # Validate password length (bcrypt limitation is 72 bytes)
     if len(user_credentials.password) > 72:
         raise HTTPException(
@@ -78,7 +109,7 @@ def login(user_credentials: UserLogin, session: Session = Depends(get_session)):
             detail="Password must not exceed 72 characters"
         )
 
-    user = authenticate_user(session, user_credentials.email, user_credentials.password)
+    user = await authenticate_user(session, user_credentials.email, user_credentials.password)
 
     if not user:
         raise HTTPException(
@@ -87,34 +118,74 @@ def login(user_credentials: UserLogin, session: Session = Depends(get_session)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create access token
-    access_token_expires = timedelta(minutes=30)  # 30 minutes expiry
-    access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
-    )
+    user_id, email, token_version = user.id, user.email, user.token_version
+    refresh_token = issue_refresh_token(session, user_id)
+    await session.commit()
+
+    return {
+        "user": {
+            "id": str(user_id),
+            "email": email,
+        },
+        "session": build_session(user_id, token_version, refresh_token)
+    }
+
+
+@router.post("/refresh")
+async def refresh(body: RefreshRequest, session: AsyncSession = Depends(get_async_session)):
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    The presented token is spent; presenting it again revokes the whole session.
+    """
+    rotated = await rotate_refresh_token(session, body.refreshToken)
+
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user_id, refresh_token = rotated
+    token_version = await get_token_version(session, user_id)
+
+    if token_version is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return {
         "user": {
-            "id": str(user.id),
-            "email": user.email,
+            "id": str(user_id),
         },
-        "session": {
-            "accessToken": access_token,
-            "expiresAt": access_token_expires.total_seconds()
-        }
+        "session": build_session(user_id, token_version, refresh_token)
     }
 
 
 @router.post("/logout")
-def logout():
+async def logout(body: Optional[LogoutRequest] = None, session: AsyncSession = Depends(get_async_session)):
     """
-    Logout user (client-side token removal)
+    Logout user: revoke the session's refresh tokens (the client drops its access token)
     """
+    if body is not None and body.refreshToken:
+        await revoke_refresh_token(session, body.refreshToken)
+
     return {"message": "Logged out successfully"}
 
 
+@router.post("/logout-all")
+async def logout_all(current_user: User = Depends(get_current_user), session: AsyncSession = Depends(get_async_session)):
+    """
+    Sign out everywhere: revoke every access and refresh token issued to the user
+    """
+    await revoke_user_tokens(session, current_user.id)
+    return {"message": "Logged out of all sessions"}
+
+
 @router.get("/me")
-def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: User = Depends(get_current_user)):
     """
     Get current user info
     """
@@ -129,7 +200,7 @@ def read_users_me(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/user-id")
-def get_user_id(user_id: str = Depends(get_current_user_from_token)):
+async def get_user_id(user_id: str = Depends(get_current_user_from_token)):
     """
     Get current user ID from token
     """
@@ -1,165 +1,787 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List
-from uuid import UUID
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, delete, insert, not_, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Literal, Optional
+from uuid import UUID, uuid4
 from datetime import datetime
+import asyncio
 
-from models.todo import Task, TaskCreate, TaskUpdate, TaskResponse
-from models.user import User
-from config.database import get_session
-from dependencies import get_current_user
+from models.todo import (
+    Task,
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskBatchResult,
+    TaskStats,
+    TaskTombstone,
+    TaskChanges,
+    TaskImportError,
+    TaskImportResponse,
+)
+from config import settings
+from config.database import async_session_factory, get_async_session
+from dependencies import get_task_read_session, get_task_user
+from schemas.auth import AuthenticatedUser
+from utils.etag import etag_matches, make_etag, task_etag
+from utils.events import RESYNC_EVENT, task_events
+from utils.negotiation import NegotiatedRoute
+from utils.pagination import decode_change_cursor, decode_cursor, encode_change_cursor, encode_cursor
+from utils.search import task_search_clause
+from utils.serialization import (
+    TASK_RESPONSE_COLUMNS,
+    encode_csv,
+    encode_ndjson,
+    json_response,
+    task_row,
+    task_rows,
+)
+from utils.task_import import (
+    ImportFormatError,
+    get_import_fields,
+    iter_csv_records,
+    iter_ndjson_records,
+    to_naive_utc,
+)
+from utils.task_state import (
+    adjust_task_counters,
+    bump_task_state,
+    get_task_state_version,
+    get_task_stats_for_user,
+    get_tombstone_floor,
+    record_tombstones,
+)
 
-router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+router = APIRouter(prefix="/api/tasks", tags=["tasks"], route_class=NegotiatedRoute)
+
+# List sort options: name -> (column, descending). Ties are broken by id in the same direction.
+TaskSort = Literal["-created_at", "created_at", "-updated_at", "updated_at", "title", "-title"]
+TASK_SORTS = {
+    "-created_at": (Task.created_at, True),
+    "created_at": (Task.created_at, False),
+    "-updated_at": (Task.updated_at, True),
+    "updated_at": (Task.updated_at, False),
+    "title": (Task.title, False),
+    "-title": (Task.title, True),
+}
+
+# Change-feed event published for each kind of batch operation
+BATCH_EVENTS = {
+    "create": "task.created",
+    "update": "task.updated",
+    "complete": "task.completed",
+    "delete": "task.deleted",
+}
+
+# Export formats: media type and file extension
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+# Clients may keep task responses but must revalidate them (If-None-Match) before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def task_event_data(task: Task) -> dict:
+    """
+    JSON-ready task payload for change-feed events
+    """
+    return TaskResponse.model_validate(task).model_dump(mode="json")
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Bare 304 answer for a conditional GET
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def get_task_field_error(title: Optional[str], description: Optional[str]) -> Optional[str]:
+    """
+    Check a title/description pair against the task rules, returning the error message if any
+    """
+    if title is not None and (len(title.strip()) < 1 or len(title) > 200):
+        return "Title must be between 1 and 200 characters"
+
+    if description is not None and len(description) > 1000:
+        return "Description must not exceed 1000 characters"
+
+    return None
 
 
 @router.get("/", response_model=List[TaskResponse])
-def get_tasks(
+async def get_tasks(
     skip: int = 0,
-    limit: int = 100,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    q: Optional[str] = Query(None, max_length=200),
+    completed: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    sort: TaskSort = "-created_at",
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_task_read_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
 ):
     """
-    Get all tasks for the current user
+    Get tasks for the current user, newest first unless another sort is requested.
+
+    q searches title and description (every word, matched as a prefix) through the
+    full-text index; completed and created_after/created_before filter server-side.
+
+    Pass the X-Next-Cursor header of a page as ?cursor= to fetch the next one; keyset
+    pages cost the same at any depth and do not shift when tasks are added meanwhile.
+    skip is still honoured for older clients.
+
+    The ETag follows the user's task change marker, so an unchanged poll is answered
+    with 304 after a single primary-key lookup.
+
+    Only the response columns are selected and encoded straight to JSON with orjson;
+    response_model is kept for the OpenAPI schema.
+
+    Served from a read replica when any are configured, except right after the user's own write.
     """
-    statement = select(Task).where(Task.user_id == current_user.id).order_by(Task.created_at.desc()).offset(skip).limit(limit)
-    tasks = session.exec(statement).all()
-    return tasks
+    # Stored timestamps are naive UTC - compare offset-aware bounds in the same terms
+    if created_after is not None:
+        created_after = to_naive_utc(created_after)
+    if created_before is not None:
+        created_before = to_naive_utc(created_before)
+
+    # Read the marker before the page: a write in between only costs the client one extra
+    # download, never a stale 304
+    version = await get_task_state_version(session, current_user.id)
+    etag = make_etag(
+        "tasks", current_user.id, version, skip, limit, cursor,
+        q, completed, created_after, created_before, sort,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    statement = select(*TASK_RESPONSE_COLUMNS).where(Task.user_id == current_user.id)
+
+    if q:
+        statement = statement.where(task_search_clause(session.bind.dialect.name, q))
+    if completed is not None:
+        statement = statement.where(Task.completed == completed)
+    if created_after is not None:
+        statement = statement.where(Task.created_at >= created_after)
+    if created_before is not None:
+        statement = statement.where(Task.created_at < created_before)
+
+    column, descending = TASK_SORTS[sort]
+
+    if cursor is not None:
+        parse = str if column.key == "title" else datetime.fromisoformat
+        value, task_id = decode_cursor(cursor, sort, parse)
+        if descending:
+            after = or_(column < value, and_(column == value, Task.id < task_id))
+        else:
+            after = or_(column > value, and_(column == value, Task.id > task_id))
+        statement = statement.where(after)
+    elif skip:
+        statement = statement.offset(skip)
+
+    # Fetch one extra row to learn whether another page follows
+    if descending:
+        statement = statement.order_by(column.desc(), Task.id.desc())
+    else:
+        statement = statement.order_by(column.asc(), Task.id.asc())
+    result = await session.exec(statement.limit(limit + 1))
+    tasks = task_rows(result.all())
+
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        headers["X-Next-Cursor"] = encode_cursor(sort, last[column.key], last["id"])
+
+    return json_response(tasks, headers)
 
 
 @router.post("/", response_model=TaskResponse)
-def create_task(
+async def create_task(
     task: TaskCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
 ):
     """
     Create a new task for the current user
     """
-    # Validate title length
-    if len(task.title.strip()) < 1 or len(task.title) > 200:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Title must be between 1 and 200 characters"
-        )
-
-    if task.description and len(task.description) > 1000:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Description must not exceed 1000 characters"
-        )
+    error = get_task_field_error(task.title, task.description)
+    if error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error)
 
+    change_seq = await bump_task_state(session, current_user.id, task_delta=1)
     db_task = Task(
         title=task.title,
         description=task.description,
-        user_id=current_user.id
+        user_id=current_user.id,
+        change_seq=change_seq
     )
 
     session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    await session.commit()
+    await session.refresh(db_task)
+    await task_events.publish(current_user.id, "task.created", task_event_data(db_task))
     return db_task
 
 
+@router.post("/batch", response_model=TaskBatchResponse)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
+):
+    """
+    Apply many create/update/delete/complete operations in a single transaction.
+
+    Invalid operations are reported in their result and skipped. The rest run as one
+    statement per kind (multi-row INSERT, bulk UPDATE, DELETE ... IN) before one commit.
+    """
+    operations = batch.operations
+    if len(operations) > settings.TASK_BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A batch may contain at most {settings.TASK_BATCH_MAX_OPERATIONS} operations"
+        )
+
+    results: List[TaskBatchResult] = []
+    now = datetime.utcnow()
+    inserts, updates, toggles, deletes = [], [], [], []
+    completions = {True: [], False: []}  # explicit completed values, applied set-based
+    referencing = []  # (result, operation) of every operation on an existing task
+
+    for index, operation in enumerate(operations):
+        outcome = TaskBatchResult(index=index, op=operation.op, status=status.HTTP_200_OK, id=operation.id)
+        results.append(outcome)
+
+        if operation.op == "create":
+            if operation.title is None:
+                error = "Title is required"
+            else:
+                error = get_task_field_error(operation.title, operation.description)
+            if error:
+                outcome.status, outcome.error = status.HTTP_422_UNPROCESSABLE_ENTITY, error
+                continue
+
+            outcome.id = uuid4()
+            outcome.status = status.HTTP_201_CREATED
+            inserts.append({
+                "id": outcome.id,
+                "title": operation.title,
+                "description": operation.description,
+                "completed": bool(operation.completed),
+                "user_id": current_user.id,
+                "created_at": now,
+                "updated_at": now,
+            })
+        elif operation.id is None:
+            outcome.status, outcome.error = status.HTTP_422_UNPROCESSABLE_ENTITY, "Task id is required"
+        else:
+            referencing.append((outcome, operation))
+
+    if not (inserts or referencing):
+        change_seq = None
+    else:
+        # Created tasks are counted up front; the other deltas come from what the statements report
+        change_seq = await bump_task_state(
+            session,
+            current_user.id,
+            task_delta=len(inserts),
+            completed_delta=sum(1 for row in inserts if row["completed"]),
+        )
+
+    # Ownership of every referenced task, checked with one query. Every task write locks the
+    # state row first, so none of these tasks can be deleted before this batch commits.
+    owned = set()
+    if referencing:
+        result = await session.exec(
+            select(Task.id).where(
+                Task.user_id == current_user.id,
+                Task.id.in_({operation.id for _, operation in referencing}),
+            )
+        )
+        owned = set(result.all())
+
+    touched = set()
+    for outcome, operation in referencing:
+        if operation.id not in owned:
+            outcome.status, outcome.error = status.HTTP_404_NOT_FOUND, "Task not found or access denied"
+            continue
+
+        if operation.id in touched:
+            outcome.status, outcome.error = status.HTTP_409_CONFLICT, "Task appears more than once in the batch"
+            continue
+
+        if operation.op == "delete":
+            deletes.append(operation.id)
+        elif operation.op == "complete" and operation.completed is None:
+            toggles.append(operation.id)
+        else:
+            fields = {"title", "description", "completed"} if operation.op == "update" else {"completed"}
+            values = operation.model_dump(include=fields, exclude_unset=True)
+            # Explicit nulls are kept by exclude_unset; only description may be cleared
+            nulled = [field for field in ("title", "completed") if field in values and values[field] is None]
+            if nulled:
+                error = f"{nulled[0].capitalize()} cannot be null"
+            else:
+                error = get_task_field_error(values.get("title"), values.get("description"))
+            if error:
+                outcome.status, outcome.error = status.HTTP_422_UNPROCESSABLE_ENTITY, error
+                continue
+            if "completed" in values:
+                completions[values.pop("completed")].append(operation.id)
+            if values:
+                updates.append({"id": operation.id, "updated_at": now, **values})
+
+        touched.add(operation.id)
+
+    if change_seq is not None and not (inserts or touched):
+        # Every operation failed: undo the bump so the version (and clients' ETags) stay put
+        await session.rollback()
+        change_seq = None
+    task_delta = completed_delta = 0
+
+    if inserts:
+        await session.exec(insert(Task), params=[{**row, "change_seq": change_seq} for row in inserts])
+    if updates:
+        # ORM bulk UPDATE by primary key - executemany, grouped by the set of changed columns
+        await session.exec(update(Task), params=[{**row, "change_seq": change_seq} for row in updates])
+    for value, ids in completions.items():
+        if ids:
+            # Only rows that actually change state are touched (and counted)
+            result = await session.exec(
+                update(Task)
+                .where(Task.user_id == current_user.id, Task.id.in_(ids), Task.completed != value)
+                .values(completed=value, updated_at=now, change_seq=change_seq)
+                .returning(Task.id)
+            )
+            changed = len(result.all())
+            completed_delta += changed if value else -changed
+    if toggles:
+        result = await session.exec(
+            update(Task)
+            .where(Task.user_id == current_user.id, Task.id.in_(toggles))
+            .values(completed=not_(Task.completed), updated_at=now, change_seq=change_seq)
+            .returning(Task.completed)
+        )
+        completed_delta += sum(1 if completed else -1 for completed in result.scalars().all())
+    if deletes:
+        result = await session.exec(
+            delete(Task)
+            .where(Task.user_id == current_user.id, Task.id.in_(deletes))
+            .returning(Task.id, Task.completed)
+        )
+        removed = result.all()
+        task_delta -= len(removed)
+        completed_delta -= sum(1 for _, completed in removed if completed)
+        await record_tombstones(session, current_user.id, [task_id for task_id, _ in removed], change_seq)
+    if change_seq is not None:
+        await adjust_task_counters(session, current_user.id, task_delta, completed_delta)
+
+    # Read back every created or modified task in one query
+    returned = [r for r in results if r.status < 300 and r.op != "delete"]
+    if returned:
+        result = await session.exec(
+            select(Task).where(Task.user_id == current_user.id, Task.id.in_([r.id for r in returned]))
+        )
+        tasks = {task.id: task for task in result.all()}
+        for outcome in returned:
+            outcome.task = TaskResponse.model_validate(tasks[outcome.id])
+
+    await session.commit()
+
+    for outcome in results:
+        if outcome.status >= 300:
+            continue
+        data = {"id": str(outcome.id)} if outcome.op == "delete" else outcome.task.model_dump(mode="json")
+        await task_events.publish(current_user.id, BATCH_EVENTS[outcome.op], data)
+
+    succeeded = sum(1 for r in results if r.status < 300)
+    return TaskBatchResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+
+@router.post("/import", response_model=TaskImportResponse)
+async def import_tasks(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
+):
+    """
+    Create tasks from an NDJSON or CSV upload (the export formats are accepted as-is).
+
+    The body is parsed as it arrives. Each row needs a title and may carry description,
+    completed and created_at; other fields are ignored. Valid rows are inserted with one
+    multi-row INSERT and commit per TASK_IMPORT_CHUNK_SIZE rows, invalid ones are reported
+    by row number. If the upload breaks off unreadably, the rows before it stay imported
+    and aborted says why.
+    """
+    user_id = current_user.id
+    records = iter_csv_records if format == "csv" else iter_ndjson_records
+    chunk: List[dict] = []
+    errors: List[TaskImportError] = []
+    imported = failed = 0
+    aborted = None
+
+    async def flush():
+        nonlocal imported
+        now = datetime.utcnow()
+        change_seq = await bump_task_state(
+            session,
+            user_id,
+            task_delta=len(chunk),
+            completed_delta=sum(1 for row in chunk if row["completed"]),
+        )
+        await session.exec(insert(Task).values([
+            {
+                **row,
+                "id": uuid4(),
+                "user_id": user_id,
+                "created_at": row["created_at"] or now,
+                "updated_at": now,
+                "change_seq": change_seq,
+            }
+            for row in chunk
+        ]))
+        await session.commit()
+        imported += len(chunk)
+        chunk.clear()
+
+    try:
+        async for row, record in records(request.stream()):
+            values, error = (None, record) if isinstance(record, str) else get_import_fields(record)
+            if values is not None:
+                error = get_task_field_error(values["title"], values["description"])
+
+            if error:
+                failed += 1
+                if len(errors) < settings.TASK_IMPORT_MAX_ERRORS:
+                    errors.append(TaskImportError(row=row, error=error))
+                continue
+
+            chunk.append(values)
+            if len(chunk) >= settings.TASK_IMPORT_CHUNK_SIZE:
+                await flush()
+    except ImportFormatError as exc:
+        if not (imported or chunk or failed):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+        aborted = str(exc)
+
+    if chunk:
+        await flush()
+    if imported:
+        # Too many tasks for one event each - tell open change feeds to re-fetch instead
+        await task_events.publish(user_id, RESYNC_EVENT, {"imported": imported})
+
+    return TaskImportResponse(imported=imported, failed=failed, errors=errors, aborted=aborted)
+
+
+@router.get("/stats", response_model=TaskStats)
+async def get_task_stats(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
+):
+    """
+    Total, completed and open task counts for the current user (one primary-key lookup)
+    """
+    return await get_task_stats_for_user(session, current_user.id)
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def get_task_changes(
+    since: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
+):
+    """
+    Tasks created, modified or deleted since a sync cursor, oldest change first.
+
+    Omit since for a full sync. Keep requesting with the returned cursor while has_more
+    is true. Changes are ordered by (change_seq, id), so a version larger than a page (a
+    big batch, or every task that predates delta sync) is split across pages. reset means
+    the cursor predates the tombstone retention window and the client must sync from scratch.
+    """
+    page_size = settings.TASK_CHANGES_PAGE_SIZE
+    since_seq, since_id = decode_change_cursor(since) if since is not None else (None, None)
+
+    if since_seq is not None and since_seq < await get_tombstone_floor(session, current_user.id):
+        return TaskChanges(tasks=[], deleted=[], cursor=encode_change_cursor(0), has_more=False, reset=True)
+
+    # Read before the changes: anything committed later carries a higher version
+    version = await get_task_state_version(session, current_user.id)
+
+    def after_cursor(seq_column, id_column):
+        if since_id is None:
+            return seq_column > since_seq
+        return or_(seq_column > since_seq, and_(seq_column == since_seq, id_column > since_id))
+
+    # A full sync starts from live tasks only - there is nothing to delete on the client yet
+    statement = (
+        select(*TASK_RESPONSE_COLUMNS, Task.change_seq)
+        .where(Task.user_id == current_user.id)
+        .order_by(Task.change_seq, Task.id)
+        .limit(page_size + 1)
+    )
+    if since_seq is not None:
+        statement = statement.where(after_cursor(Task.change_seq, Task.id))
+    tasks = (await session.exec(statement)).all()
+
+    deleted = []
+    if since_seq is not None:
+        deleted = (await session.exec(
+            select(TaskTombstone.task_id, TaskTombstone.change_seq)
+            .where(
+                TaskTombstone.user_id == current_user.id,
+                after_cursor(TaskTombstone.change_seq, TaskTombstone.task_id),
+            )
+            .order_by(TaskTombstone.change_seq, TaskTombstone.task_id)
+            .limit(page_size + 1)
+        )).all()
+
+    changes = sorted(
+        [((task.change_seq, task.id), task_row(task)) for task in tasks]
+        + [((seq, task_id), task_id) for task_id, seq in deleted],
+        key=lambda change: change[0],
+    )
+    has_more = len(changes) > page_size
+
+    if has_more:
+        changes = changes[:page_size]
+        cursor = encode_change_cursor(*changes[-1][0])
+    else:
+        # Caught up - resume after everything seen, or after the version read up front
+        last_seq = changes[-1][0][0] if changes else 0
+        cursor = encode_change_cursor(max(since_seq or 0, version, last_seq))
+
+    return json_response({
+        "tasks": [item for _, item in changes if isinstance(item, dict)],
+        "deleted": [item for _, item in changes if not isinstance(item, dict)],
+        "cursor": cursor,
+        "has_more": has_more,
+        "reset": False,
+    })
+
+
+@router.get("/export")
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
+):
+    """
+    Stream every task of the current user as NDJSON (one task per line) or CSV, oldest first.
+
+    Rows are read through a streaming cursor TASK_EXPORT_BATCH_SIZE at a time and written
+    out batch by batch, so memory stays flat however many tasks the user has.
+    """
+    # The export runs on its own session for as long as the client reads - release this one
+    user_id = current_user.id
+    await session.close()
+
+    media_type, extension = EXPORT_FORMATS[format]
+    statement = (
+        select(*TASK_RESPONSE_COLUMNS)
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at, Task.id)
+        .execution_options(yield_per=settings.TASK_EXPORT_BATCH_SIZE)
+    )
+
+    async def stream():
+        if format == "csv":
+            yield encode_csv([], header=True)
+
+        async with async_session_factory() as export_session:
+            result = await export_session.stream(statement)
+            async for rows in result.partitions():
+                yield encode_csv(rows) if format == "csv" else encode_ndjson(rows)
+
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{extension}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/events")
+async def stream_task_events(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
+):
+    """
+    Server-Sent Events stream of the current user's task changes.
+
+    Emits task.created, task.updated, task.completed and task.deleted events, a comment
+    heartbeat while idle, and resync when the client fell too far behind to catch up.
+    """
+    # The stream may stay open for hours - hand the pooled connection back right away
+    user_id = current_user.id
+    await session.close()
+
+    async def stream():
+        with task_events.subscribe(user_id) as subscription:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                if message is None:
+                    # Server shutting down
+                    break
+                yield message
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(
+async def get_task(
     task_id: UUID,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_task_read_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
 ):
     """
-    Get a specific task by ID
+    Get a specific task by ID (from a read replica unless the user just wrote)
     """
-    statement = select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
-    db_task = session.exec(statement).first()
+    if if_none_match:
+        # Revalidation only needs the version column - skip loading and serializing the task
+        result = await session.exec(
+            select(Task.updated_at).where(Task.id == task_id, Task.user_id == current_user.id)
+        )
+        updated_at = result.first()
+        if updated_at is not None and etag_matches(if_none_match, task_etag(task_id, updated_at)):
+            return not_modified(task_etag(task_id, updated_at))
 
-    if not db_task:
+    statement = select(*TASK_RESPONSE_COLUMNS).where(Task.id == task_id, Task.user_id == current_user.id)
+    result = await session.exec(statement)
+    row = result.first()
+
+    if not row:
         raise HTTPException(status_code=404, detail="Task not found or access denied")
 
-    return db_task
+    db_task = task_row(row)
+    return json_response(db_task, {
+        "ETag": task_etag(db_task["id"], db_task["updated_at"]),
+        "Cache-Control": CACHE_CONTROL,
+    })
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_task(
+async def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
 ):
     """
-    Update a specific task by ID
+    Update a specific task by ID with a single UPDATE ... RETURNING
     """
-    statement = select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
-    db_task = session.exec(statement).first()
+    error = get_task_field_error(task_update.title, task_update.description)
+    if error:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=error)
 
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found or access denied")
+    # Update only the fields that were provided (a missing task rolls the bump back)
+    values = task_update.model_dump(exclude_unset=True)
+    change_seq = await bump_task_state(session, current_user.id)
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .values(**values, updated_at=datetime.utcnow(), change_seq=change_seq)
+        .returning(Task)
+    )
+    db_task = None
 
-    # Validate input if title is being updated
-    if task_update.title is not None:
-        if len(task_update.title.strip()) < 1 or len(task_update.title) > 200:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="Title must be between 1 and 200 characters"
-            )
+    if values.get("completed") is not None:
+        # Try the update as a state change first, so the stats learn whether completed flipped
+        result = await session.exec(statement.where(Task.completed != values["completed"]))
+        db_task = result.scalars().first()
+        if db_task:
+            await adjust_task_counters(session, current_user.id, completed_delta=1 if db_task.completed else -1)
 
-    if task_update.description is not None and len(task_update.description) > 1000:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Description must not exceed 1000 characters"
-        )
+    if not db_task:
+        result = await session.exec(statement)
+        db_task = result.scalars().first()
 
-    # Update only the fields that were provided
-    for field, value in task_update.dict(exclude_unset=True).items():
-        setattr(db_task, field, value)
+    if not db_task:
+        raise HTTPException(status_code=404, detail="Task not found or access denied")
 
-    db_task.updated_at = datetime.utcnow()
-    session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    await session.commit()
+    await task_events.publish(current_user.id, "task.updated", task_event_data(db_task))
     return db_task
 
 
 @router.delete("/{task_id}")
-def delete_task(
+async def delete_task(
     task_id: UUID,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
 ):
     """
-    Delete a specific task by ID
+    Delete a specific task by ID with a single DELETE ... RETURNING, leaving a tombstone for delta sync
     """
-    statement = select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
-    db_task = session.exec(statement).first()
+    # State row before task row, like every other write (a missing task rolls the bump back)
+    change_seq = await bump_task_state(session, current_user.id, task_delta=-1)
+    statement = (
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .returning(Task.completed)
+    )
+    result = await session.exec(statement)
+    was_completed = result.scalar_one_or_none()
 
-    if not db_task:
+    if was_completed is None:
         raise HTTPException(status_code=404, detail="Task not found or access denied")
 
-    session.delete(db_task)
-    session.commit()
+    if was_completed:
+        await adjust_task_counters(session, current_user.id, completed_delta=-1)
+    await record_tombstones(session, current_user.id, [task_id], change_seq)
+    await session.commit()
+    await task_events.publish(current_user.id, "task.deleted", {"id": str(task_id)})
     return {"message": "Task deleted successfully"}
 
 
 @router.patch("/{task_id}/complete", response_model=TaskResponse)
-def complete_task(
+async def complete_task(
     task_id: UUID,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_user)
+    session: AsyncSession = Depends(get_async_session),
+    current_user: AuthenticatedUser = Depends(get_task_user)
 ):
     """
     Toggle the completion status of a specific task
     """
-    statement = select(Task).where(Task.id == task_id, Task.user_id == current_user.id)
-    db_task = session.exec(statement).first()
+    # Flip the flag inside the UPDATE so concurrent toggles cannot lose a write
+    change_seq = await bump_task_state(session, current_user.id)
+    statement = (
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .values(completed=not_(Task.completed), updated_at=datetime.utcnow(), change_seq=change_seq)
+        .returning(Task)
+    )
+    result = await session.exec(statement)
+    db_task = result.scalars().first()
 
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found or access denied")
 
-    # Toggle the completed status
-    db_task.completed = not db_task.completed
-    db_task.updated_at = datetime.utcnow()
-
-    session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
-    return db_task
\ No newline at end of file
+    await adjust_task_counters(session, current_user.id, completed_delta=1 if db_task.completed else -1)
+    await session.commit()
+    await task_events.publish(current_user.id, "task.completed", task_event_data(db_task))
+    return db_task
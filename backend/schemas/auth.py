@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+import uuid
 
 
 class Token(BaseModel):
@@ -8,6 +9,11 @@ class Token(BaseModel):
     token_type: str
 
 
+class AuthenticatedUser(BaseModel):
+    """Identity taken from a verified access token, without loading the user row"""
+    id: uuid.UUID
+
+
 class TokenData(BaseModel):
     """Schema for token data"""
     email: Optional[str] = None
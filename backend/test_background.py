@@ -0,0 +1,22 @@
+from utils.background import run_periodically
+import asyncio
+
+
+def test_failed_run_is_logged_and_retried(caplog):
+    """Test that an error in one run is logged under the job's name and the loop keeps running"""
+    runs = []
+
+    async def flaky_job():
+        runs.append(len(runs))
+        if len(runs) == 1:
+            raise ConnectionError("database unavailable")
+
+    async def run_two_passes():
+        loop = asyncio.create_task(run_periodically(flaky_job, 0, "Flaky job"))
+        while len(runs) < 2:
+            await asyncio.sleep(0)
+        loop.cancel()
+
+    asyncio.run(run_two_passes())
+    assert "Flaky job failed" in caplog.text
+    assert "database unavailable" in caplog.text
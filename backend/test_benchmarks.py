@@ -0,0 +1,51 @@
+from benchmarks import startup
+from benchmarks.load import compare, parse_args, percentile, summarize
+import os
+
+
+def test_percentiles_use_nearest_rank():
+    """Test p50/p95/p99 on a known distribution"""
+    values = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert percentile(values, 0.50) == 0.050
+    assert percentile(values, 0.95) == 0.095
+    assert percentile(values, 0.99) == 0.099
+    assert percentile([], 0.5) == 0.0
+
+    stats = summarize(values, errors=2)
+    assert stats["count"] == 100 and stats["errors"] == 2
+    assert stats["p95_ms"] == 95.0 and stats["max_ms"] == 100.0
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    """Test that slower p95s and lower throughput beyond the tolerance are reported"""
+    def results(throughput, p95):
+        return {"scenarios": {"crud": {"throughput_rps": throughput, "operations": {"get": {"p95_ms": p95}}}}}
+
+    baseline = results(100.0, 10.0)
+    assert compare(results(90.0, 12.0), baseline, tolerance=0.25) == []
+    assert compare(results(70.0, 10.0), baseline, tolerance=0.25) == [
+        "crud: throughput 70.0 req/s < baseline 100.0 req/s"
+    ]
+    assert compare(results(100.0, 13.0), baseline, tolerance=0.25) == [
+        "crud/get: p95 13.0 ms > baseline 10.0 ms"
+    ]
+    # Scenarios missing from the baseline are not compared
+    assert compare(results(1.0, 1000.0), {"scenarios": {}}, tolerance=0.25) == []
+
+
+def test_default_options_run_every_scenario():
+    """Test the command line defaults"""
+    options = parse_args([])
+    assert options.scenarios == ["auth", "crud", "pagination"]
+    assert options.base_url is None and options.tolerance == 0.25
+
+
+def test_startup_benchmark_boots_without_deferred_imports(tmp_path):
+    """Test a cold boot end to end, and that importing the app leaves jose/passlib/dotenv/alembic unloaded"""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}")
+    boots = startup.measure(2, env)
+
+    for boot in boots:
+        assert boot["deferred_loaded"] == []
+        assert boot["import_ms"] > 0 and boot["first_request_ms"] > 0
+        assert boot["total_ms"] >= boot["import_ms"] + boot["startup_ms"]
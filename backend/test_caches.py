@@ -0,0 +1,90 @@
+from utils.cache import TTLCache
+from utils.auth import user_cache
+from utils.security import (
+    create_access_token,
+    evict_user_tokens,
+    revoke_token,
+    token_cache,
+    verify_token,
+)
+from datetime import timedelta
+from uuid import uuid4
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries disappear once their TTL has passed"""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the cache stays bounded and evicts the LRU entry"""
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_current_user_is_served_from_cache(client):
+    """Test that repeated authenticated calls hit the principal cache"""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"cache-{uuid4().hex}@example.com", "password": "testpassword123"}
+    )
+    token = response.json()["session"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.get("/api/auth/me", headers=headers)
+    hits_before = user_cache.hits
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert user_cache.hits == hits_before + 1
+
+
+def test_verified_tokens_are_cached_until_revoked():
+    """Test that a verified token skips re-verification until it is evicted"""
+    token = create_access_token({"sub": str(uuid4())}, expires_delta=timedelta(minutes=5))
+
+    assert verify_token(token) is not None
+    hits_before = token_cache.hits
+    assert verify_token(token)["sub"]
+    assert token_cache.hits == hits_before + 1
+
+    revoke_token(token)
+    misses_before = token_cache.misses
+    assert verify_token(token) is not None
+    assert token_cache.misses == misses_before + 1
+
+
+def test_user_tokens_can_be_evicted():
+    """Test that every cached token of a user can be evicted at once"""
+    user_id = uuid4()
+    first = create_access_token({"sub": str(user_id)}, expires_delta=timedelta(minutes=5))
+    second = create_access_token({"sub": str(user_id), "n": 2}, expires_delta=timedelta(minutes=5))
+    verify_token(first)
+    verify_token(second)
+
+    assert evict_user_tokens(user_id) == 2
@@ -0,0 +1,49 @@
+from sqlalchemy import text
+from config import settings
+from config.database import async_engine, engine, get_pool_stats
+
+SYNCHRONOUS_LEVELS = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+
+
+def test_async_connections_get_the_sqlite_pragmas(client):
+    """Test that connections of the async engine are opened with the configured PRAGMAs"""
+    async def read_pragmas():
+        async with async_engine.connect() as connection:
+            return {
+                name: (await connection.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in ("journal_mode", "synchronous", "cache_size", "mmap_size", "busy_timeout")
+            }
+
+    # Run on the app's event loop, which owns the pooled connections
+    pragmas = client.portal.call(read_pragmas)
+
+    assert pragmas["journal_mode"] == settings.SQLITE_JOURNAL_MODE.lower()
+    assert pragmas["synchronous"] == SYNCHRONOUS_LEVELS[settings.SQLITE_SYNCHRONOUS.upper()]
+    assert pragmas["cache_size"] == settings.SQLITE_CACHE_SIZE
+    assert pragmas["mmap_size"] == settings.SQLITE_MMAP_SIZE
+    assert pragmas["busy_timeout"] == settings.SQLITE_BUSY_TIMEOUT
+
+
+def test_pool_options_reach_the_engines():
+    """Test that the configured pool size, overflow, timeout and recycle are applied to both engines"""
+    for pool in (engine.pool, async_engine.pool):
+        assert pool.size() == settings.DB_POOL_SIZE
+        assert pool._max_overflow == settings.DB_MAX_OVERFLOW
+        assert pool._timeout == settings.DB_POOL_TIMEOUT
+        assert pool._recycle == settings.DB_POOL_RECYCLE
+        assert pool._pre_ping == settings.DB_POOL_PRE_PING
+
+    stats = get_pool_stats()
+    assert stats["async"]["pool"] == type(async_engine.pool).__name__
+    assert set(stats["async"]) >= {"size", "checkedin", "checkedout", "overflow"}
+    assert stats["configured"]["pool_size"] == settings.DB_POOL_SIZE
+
+
+def test_health_db_reports_pool_stats(client):
+    """Test the shape of the /health/db response"""
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    body = response.json()
+    assert {"sync", "async", "configured"} <= set(body)
+    assert body["async"]["size"] == settings.DB_POOL_SIZE
+    assert body["configured"]["max_overflow"] == settings.DB_MAX_OVERFLOW
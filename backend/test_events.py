@@ -0,0 +1,102 @@
+from config import settings
+from routers import tasks as tasks_router
+from schemas.auth import AuthenticatedUser
+from utils.events import InMemoryEventBackend, TaskEventBroker, format_sse, task_events
+from uuid import UUID, uuid4
+import asyncio
+import json
+
+
+def read_event(subscription):
+    """Split a queued SSE frame into its event name and decoded data"""
+    event, data = subscription.get_nowait().strip().split("\n")
+    return event[len("event: "):], json.loads(data[len("data: "):])
+
+
+def test_broker_fans_out_to_the_users_subscribers_only():
+    """Test that events reach every subscriber of the user and nobody else"""
+    broker = TaskEventBroker(InMemoryEventBackend(queue_size=10))
+    user_id, other_id = uuid4(), uuid4()
+    first, second, other = broker.subscribe(user_id), broker.subscribe(user_id), broker.subscribe(other_id)
+
+    asyncio.run(broker.publish(user_id, "task.created", {"id": "1"}))
+
+    assert read_event(first) == ("task.created", {"id": "1"})
+    assert read_event(second) == ("task.created", {"id": "1"})
+    assert other.queue.empty()
+
+    first.close()
+    second.close()
+    other.close()
+    assert broker.backend.subscriber_count() == 0
+
+
+def test_slow_subscriber_gets_resync_instead_of_unbounded_queue():
+    """Test that an overflowing subscriber is told to re-fetch rather than buffering forever"""
+    broker = TaskEventBroker(InMemoryEventBackend(queue_size=2))
+    user_id = uuid4()
+
+    with broker.subscribe(user_id) as subscription:
+        for index in range(5):
+            asyncio.run(broker.publish(user_id, "task.created", {"id": str(index)}))
+
+        assert read_event(subscription)[0] == "resync"
+
+        asyncio.run(broker.close())
+        assert subscription.get_nowait() is None
+
+
+def test_task_mutations_are_published(client):
+    """Test that the task router publishes an event for each mutation"""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"events-{uuid4().hex}@example.com", "password": "testpassword123"}
+    )
+    body = response.json()
+    headers = {"Authorization": f"Bearer {body['session']['accessToken']}"}
+
+    with task_events.subscribe(UUID(body["user"]["id"])) as subscription:
+        task = client.post("/api/tasks/", json={"title": "Stream me"}, headers=headers).json()
+        client.patch(f"/api/tasks/{task['id']}/complete", headers=headers)
+        client.delete(f"/api/tasks/{task['id']}", headers=headers)
+
+        assert read_event(subscription) == ("task.created", task)
+        event, data = read_event(subscription)
+        assert event == "task.completed" and data["completed"] is True
+        assert read_event(subscription) == ("task.deleted", {"id": task["id"]})
+
+
+def test_event_stream_sends_retry_heartbeats_and_ends_on_shutdown(monkeypatch):
+    """Test the /events body: retry preamble, keep-alive while idle, events, and the end on close"""
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_SECONDS", 0.01)
+    broker = TaskEventBroker(InMemoryEventBackend(queue_size=10))
+    monkeypatch.setattr(tasks_router, "task_events", broker)
+    user_id = uuid4()
+
+    class ClosableSession:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    async def read_stream():
+        session = ClosableSession()
+        response = await tasks_router.stream_task_events(session, AuthenticatedUser(id=user_id))
+        assert session.closed
+        assert response.media_type == "text/event-stream"
+
+        frames = response.body_iterator
+        received = [await frames.__anext__(), await frames.__anext__()]
+        await broker.publish(user_id, "task.created", {"id": "1"})
+        received.append(await frames.__anext__())
+        assert broker.backend.subscriber_count() == 1
+
+        await broker.close()
+        received.extend([frame async for frame in frames])
+        return received
+
+    frames = asyncio.run(read_stream())
+    assert frames[:2] == ["retry: 5000\n\n", ": keep-alive\n\n"]
+    assert frames[2] == format_sse("task.created", {"id": "1"})
+    assert all(frame == ": keep-alive\n\n" for frame in frames[3:])
+    assert broker.backend.subscriber_count() == 0
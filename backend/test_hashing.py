@@ -0,0 +1,61 @@
+from fastapi import HTTPException
+from utils.hashing import PasswordHasher
+from utils.security import get_password_hash, verify_password
+import asyncio
+import pytest
+import time
+
+
+def slow_identity(value, delay):
+    time.sleep(delay)
+    return value
+
+
+def test_hasher_runs_bcrypt_off_the_event_loop():
+    """Test that hashing and verification round-trip through the pool"""
+    hasher = PasswordHasher(workers=0, max_pending=4, timeout=10)
+
+    async def scenario():
+        hashed = await hasher.run(get_password_hash, "testpassword123")
+        return await hasher.run(verify_password, "testpassword123", hashed)
+
+    try:
+        assert asyncio.run(scenario()) is True
+    finally:
+        hasher.shutdown()
+
+
+def test_hasher_rejects_when_queue_is_full():
+    """Test that calls beyond max_pending fail fast with 503"""
+    hasher = PasswordHasher(workers=0, max_pending=1, timeout=10)
+
+    async def scenario():
+        running = asyncio.ensure_future(hasher.run(slow_identity, "ok", 0.2))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as excinfo:
+            await hasher.run(slow_identity, "rejected", 0)
+        assert excinfo.value.status_code == 503
+        return await running
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        assert hasher.stats()["rejected"] == 1
+        assert hasher.stats()["pending"] == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_hasher_times_out_slow_calls():
+    """Test that a call exceeding the timeout is reported as 503"""
+    hasher = PasswordHasher(workers=0, max_pending=4, timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(HTTPException) as excinfo:
+            await hasher.run(slow_identity, "late", 0.3)
+        assert excinfo.value.status_code == 503
+
+    try:
+        asyncio.run(scenario())
+        assert hasher.stats()["timed_out"] == 1
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,60 @@
+from utils.metrics import Histogram
+from uuid import uuid4
+import re
+
+
+def sample(text, name, **labels):
+    """Value of the sample with exactly these labels in a /metrics scrape, or None"""
+    rendered = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{re.escape('{' + rendered + '}' if rendered else '')} (\S+)$", text, re.M)
+    return float(match.group(1)) if match else None
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test the text format of a histogram: cumulative buckets, +Inf, sum and count"""
+    histogram = Histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "/x")
+
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/x",le="0.1"} 1',
+        'demo_seconds_bucket{route="/x",le="1"} 2',
+        'demo_seconds_bucket{route="/x",le="+Inf"} 3',
+        'demo_seconds_sum{route="/x"} 5.55',
+        'demo_seconds_count{route="/x"} 3',
+    ]
+
+
+def test_metrics_cover_routes_queries_pools_and_hashing(client):
+    """Test that requests are recorded under their route template with status, DB usage and bcrypt time"""
+    before = client.get("/metrics").text
+    token = client.post(
+        "/api/auth/register",
+        json={"email": f"metrics-{uuid4().hex}@example.com", "password": "testpassword123"}
+    ).json()["session"]["accessToken"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get(f"/api/tasks/{uuid4()}", headers=headers)
+    client.get("/api/tasks/", headers=headers)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    route = {"method": "GET", "route": "/api/tasks/{task_id}"}
+    count_before = sample(before, "http_requests_total", **route, status="404") or 0
+    assert sample(text, "http_requests_total", **route, status="404") == count_before + 1
+    assert sample(text, "http_request_duration_seconds_count", **route) >= 1
+    assert sample(text, "http_requests_in_flight", **route) == 0
+    assert sample(text, "http_requests_in_flight", method="GET", route="/metrics") == 1
+
+    # The list request ran at least the version lookup and the page query
+    list_route = {"method": "GET", "route": "/api/tasks/"}
+    assert sample(text, "db_queries_per_request_sum", **list_route) >= 2
+    assert sample(text, "db_query_seconds_per_request_sum", **list_route) > 0
+
+    assert sample(text, "password_hash_seconds_count", operation="get_password_hash") >= 1
+    assert sample(text, "db_pool_connections", engine="async", state="checkedout") is not None
+    assert sample(text, "password_hash_pending") == 0
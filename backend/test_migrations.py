@@ -0,0 +1,231 @@
+from alembic import command
+from alembic.script import ScriptDirectory
+from datetime import datetime
+from sqlalchemy import and_, create_engine, event, inspect, or_
+from sqlmodel import select
+from models.todo import Task
+from utils.schema import SCHEMA_REVISION, SchemaVersionError, ensure_schema, get_alembic_config
+from uuid import uuid4
+import os
+import pytest
+import subprocess
+import sys
+
+
+@pytest.fixture()
+def migrated_engine(tmp_path):
+    """A fresh SQLite database upgraded to the latest migration"""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(get_alembic_config(url), "head")
+
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+def explain(connection, statement) -> str:
+    """Return SQLite's query plan for a statement as a single string"""
+    def add_explain(conn, cursor, sql, parameters, context, executemany):
+        return "EXPLAIN QUERY PLAN " + sql, parameters
+
+    event.listen(connection, "before_cursor_execute", add_explain, retval=True)
+    try:
+        rows = connection.execute(statement).cursor.fetchall()
+    finally:
+        event.remove(connection, "before_cursor_execute", add_explain)
+
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_migrations_create_task_indexes(migrated_engine):
+    """Test that upgrading to head creates the per-user task indexes"""
+    indexes = {index["name"]: index["column_names"] for index in inspect(migrated_engine).get_indexes("task")}
+
+    assert indexes["ix_task_user_id_created_at_id"][0] == "user_id"
+    assert indexes["ix_task_user_id_completed"] == ["user_id", "completed"]
+
+
+def test_hot_task_queries_use_indexes(migrated_engine):
+    """Test that the list, keyset, completed-filter and delta-sync queries are served by the indexes"""
+    user_id = uuid4()
+    now = datetime.utcnow()
+
+    list_page = (
+        select(Task)
+        .where(Task.user_id == user_id)
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(101)
+    )
+    keyset_page = (
+        select(Task)
+        .where(
+            Task.user_id == user_id,
+            or_(Task.created_at < now, and_(Task.created_at == now, Task.id < uuid4())),
+        )
+        .order_by(Task.created_at.desc(), Task.id.desc())
+        .limit(101)
+    )
+    open_tasks = select(Task.id).where(Task.user_id == user_id, Task.completed == False)  # noqa: E712
+    changes_page = (
+        select(Task)
+        .where(
+            Task.user_id == user_id,
+            or_(Task.change_seq > 0, and_(Task.change_seq == 0, Task.id > uuid4())),
+        )
+        .order_by(Task.change_seq, Task.id)
+        .limit(501)
+    )
+
+    with migrated_engine.connect() as connection:
+        for statement in (list_page, keyset_page):
+            plan = explain(connection, statement)
+            assert "ix_task_user_id_created_at_id" in plan
+            assert "TEMP B-TREE" not in plan
+
+        assert "ix_task_user_id_completed" in explain(connection, open_tasks)
+
+        plan = explain(connection, changes_page)
+        assert "ix_task_user_id_change_seq_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_search_index_is_maintained_by_triggers(migrated_engine):
+    """Test that the migrated FTS5 table follows inserts, updates and deletes"""
+    user_id, task_id = uuid4(), uuid4()
+    now = datetime.utcnow()
+
+    with migrated_engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO user (id, email, hashed_password, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (user_id.hex, "fts@example.com", "x", now, now),
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO task (id, user_id, title, description, completed, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, 0, ?, ?)",
+            (task_id.hex, user_id.hex, "Water plants", None, now, now),
+        )
+
+        def matches(term):
+            return connection.exec_driver_sql(
+                "SELECT count(*) FROM task_fts WHERE task_fts MATCH ?", (term,)
+            ).scalar()
+
+        assert matches("water") == 1
+        connection.exec_driver_sql("UPDATE task SET title = 'Feed cat' WHERE id = ?", (task_id.hex,))
+        assert matches("water") == 0 and matches("cat") == 1
+        connection.exec_driver_sql("DELETE FROM task WHERE id = ?", (task_id.hex,))
+        assert matches("cat") == 0
+
+
+def test_task_counters_are_backfilled(tmp_path):
+    """Test that adding the counters computes them for existing tasks"""
+    url = f"sqlite:///{tmp_path / 'backfill.db'}"
+    config = get_alembic_config(url)
+    command.upgrade(config, "0004_task_search")
+
+    user_id = uuid4()
+    now = datetime.utcnow()
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "INSERT INTO user (id, email, hashed_password, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (user_id.hex, "backfill@example.com", "x", now, now),
+        )
+        for completed in (True, False, False):
+            connection.exec_driver_sql(
+                "INSERT INTO task (id, user_id, title, completed, created_at, updated_at) "
+                "VALUES (?, ?, 'Old task', ?, ?, ?)",
+                (uuid4().hex, user_id.hex, completed, now, now),
+            )
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        counters = connection.exec_driver_sql(
+            "SELECT task_count, completed_count FROM usertaskstate WHERE user_id = ?", (user_id.hex,)
+        ).one()
+    engine.dispose()
+
+    assert tuple(counters) == (3, 1)
+
+
+def test_schema_revision_is_the_migration_head(tmp_path):
+    """Test that the revision checked at startup is the newest migration"""
+    config = get_alembic_config(f"sqlite:///{tmp_path / 'unused.db'}")
+    assert ScriptDirectory.from_config(config).get_current_head() == SCHEMA_REVISION
+
+
+def test_startup_check_migrates_once_then_only_reads_the_revision(tmp_path):
+    """Test that an empty database is migrated, and later boots run a single query and no DDL"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+
+    with pytest.raises(SchemaVersionError):
+        ensure_schema(engine, "verify")
+    assert ensure_schema(engine, "upgrade") == SCHEMA_REVISION
+    assert inspect(engine).has_table("refreshtoken")
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    assert ensure_schema(engine, "verify") == SCHEMA_REVISION
+    assert statements == ["SELECT version_num FROM alembic_version"]
+    engine.dispose()
+
+
+def test_startup_check_adopts_unversioned_tables(tmp_path):
+    """Test that tables built by the pre-migration create_all are upgraded in place, keeping their rows"""
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    command.upgrade(get_alembic_config(url), "0001_initial_schema")
+
+    user_id, task_id = uuid4(), uuid4()
+    now = datetime.utcnow()
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        # What create_all left behind: the baseline tables and no migration history
+        connection.exec_driver_sql("DROP TABLE alembic_version")
+        connection.exec_driver_sql(
+            "INSERT INTO user (id, email, hashed_password, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (user_id.hex, "legacy@example.com", "x", now, now),
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO task (id, user_id, title, completed, created_at, updated_at) "
+            "VALUES (?, ?, 'Old task', 1, ?, ?)",
+            (task_id.hex, user_id.hex, now, now),
+        )
+
+    with pytest.raises(SchemaVersionError, match="alembic upgrade head"):
+        ensure_schema(engine, "verify")
+    assert ensure_schema(engine, "upgrade") == SCHEMA_REVISION
+
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT change_seq FROM task WHERE id = ?", (task_id.hex,)).scalar() == 0
+        counters = connection.exec_driver_sql(
+            "SELECT task_count, completed_count FROM usertaskstate WHERE user_id = ?", (user_id.hex,)
+        ).one()
+    engine.dispose()
+
+    assert tuple(counters) == (1, 1)
+
+
+def test_workers_starting_together_migrate_once(tmp_path):
+    """Test that concurrent upgrade-mode startups serialize on the migration lock instead of crashing"""
+    url = f"sqlite:///{tmp_path / 'workers.db'}"
+    script = (
+        "from sqlalchemy import create_engine; from utils.schema import ensure_schema; "
+        f"print(ensure_schema(create_engine({url!r}, connect_args={{'timeout': 30}}), 'upgrade'))"
+    )
+    env = {**os.environ, "DATABASE_URL": url, "HASH_WORKERS": "0"}
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", script],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(3)
+    ]
+    outputs = [worker.communicate() for worker in workers]
+
+    assert [worker.returncode for worker in workers] == [0, 0, 0], [stderr for _, stderr in outputs]
+    assert [stdout.strip() for stdout, _ in outputs] == [SCHEMA_REVISION] * 3
@@ -0,0 +1,72 @@
+from routers import auth as auth_router
+from utils.rate_limit import AuthRateLimiter, InMemoryBucketStore, auth_rate_limiter
+from uuid import uuid4
+import asyncio
+import pytest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_a_burst_then_refills_at_the_rate():
+    """Test that a bucket admits capacity requests, then one per refill interval"""
+    clock = FakeClock()
+    store = InMemoryBucketStore(maxsize=10, clock=clock)
+
+    async def take():
+        return await store.take("ip:1.2.3.4", rate=0.5, capacity=3)
+
+    assert [asyncio.run(take()) for _ in range(3)] == [0, 0, 0]
+    assert asyncio.run(take()) == pytest.approx(2.0)  # one token takes 2s at 0.5/s
+
+    clock.now = 2.0
+    assert asyncio.run(take()) == 0
+    assert asyncio.run(take()) == pytest.approx(2.0)
+
+    clock.now = 100.0  # refill never exceeds the capacity
+    assert [asyncio.run(take()) for _ in range(4)][-1] > 0
+
+
+def test_bucket_store_stays_bounded():
+    """Test that the least recently used buckets are dropped beyond maxsize"""
+    store = InMemoryBucketStore(maxsize=2)
+    for key in ("a", "b", "c"):
+        asyncio.run(store.take(key, rate=1, capacity=1))
+    assert len(store) == 2
+
+
+def test_client_ip_only_trusts_the_proxy_hop():
+    """Test that X-Forwarded-For is ignored unless configured, and then its last hop is used"""
+    class FakeRequest:
+        headers = {"x-forwarded-for": "6.6.6.6, 10.0.0.7"}
+        client = type("Client", (), {"host": "10.0.0.1"})
+
+    store = InMemoryBucketStore(maxsize=10)
+    assert AuthRateLimiter(store, 60, 10, 6, 6).client_ip(FakeRequest) == "10.0.0.1"
+    assert AuthRateLimiter(store, 60, 10, 6, 6, trust_proxy=True).client_ip(FakeRequest) == "10.0.0.7"
+
+
+def test_login_storm_for_one_email_gets_429_before_hashing(client, monkeypatch):
+    """Test that attempts beyond the per-email burst are rejected with Retry-After and never verified"""
+    email = f"limited-{uuid4().hex}@example.com"
+    credentials = {"email": email, "password": "wrongpassword"}
+    for _ in range(int(auth_rate_limiter.email_burst)):
+        assert client.post("/api/auth/login", json=credentials).status_code == 401
+
+    async def must_not_run(*args):
+        raise AssertionError("rate-limited login reached password verification")
+
+    monkeypatch.setattr(auth_router, "authenticate_user", must_not_run)
+    response = client.post("/api/auth/login", json={**credentials, "email": email.upper()})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    # Other accounts are unaffected
+    monkeypatch.undo()
+    other = {"email": f"other-{uuid4().hex}@example.com", "password": "wrongpassword"}
+    assert client.post("/api/auth/login", json=other).status_code == 401
@@ -0,0 +1,65 @@
+from sqlalchemy import create_engine
+from config import database
+from config.database import create_request_engine, create_session_factory, engine
+from utils.read_routing import recent_writers
+from utils.schema import ensure_schema
+from uuid import UUID, uuid4
+import asyncio
+import pytest
+import sqlite3
+
+
+@pytest.fixture()
+def replicas(tmp_path, monkeypatch):
+    """Two SQLite files standing in for read replicas, migrated but empty (not yet replicated)"""
+    paths = [tmp_path / f"replica_{index}.db" for index in range(2)]
+    engines = []
+    for path in paths:
+        url = f"sqlite:///{path}"
+        sync_engine = create_engine(url)
+        ensure_schema(sync_engine, "upgrade")
+        sync_engine.dispose()
+        engines.append(create_request_engine(url))
+
+    monkeypatch.setattr(database, "replica_session_factories", [create_session_factory(bind) for bind in engines])
+    yield paths
+
+    for replica_engine in engines:
+        asyncio.run(replica_engine.dispose())
+
+
+def replicate(path):
+    """Copy the primary's current contents into a replica file"""
+    primary = sqlite3.connect(engine.url.database)
+    replica = sqlite3.connect(path)
+    try:
+        primary.backup(replica)
+    finally:
+        primary.close()
+        replica.close()
+
+
+def test_reads_go_to_replicas_except_right_after_a_write(client, replicas):
+    """Test read-your-writes on the primary, then round-robin replica reads once the window passes"""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"replica-{uuid4().hex}@example.com", "password": "testpassword123"}
+    )
+    user_id = UUID(response.json()["user"]["id"])
+    headers = {"Authorization": f"Bearer {response.json()['session']['accessToken']}"}
+
+    task = client.post("/api/tasks/", json={"title": "Replicated"}, headers=headers).json()
+
+    # The user's own write is visible at once: their reads stick to the primary
+    assert [t["id"] for t in client.get("/api/tasks/", headers=headers).json()] == [task["id"]]
+    assert client.get(f"/api/tasks/{task['id']}", headers=headers).status_code == 200
+
+    # Once the window has passed, reads hit the (still empty) replicas
+    recent_writers.pop(user_id)
+    assert client.get("/api/tasks/", headers=headers).json() == []
+    assert client.get(f"/api/tasks/{task['id']}", headers=headers).status_code == 404
+
+    # Only the first replica has caught up - consecutive reads alternate between the two
+    replicate(replicas[0])
+    pages = [client.get("/api/tasks/", headers=headers).json() for _ in range(2)]
+    assert sorted(len(page) for page in pages) == [0, 1]
@@ -0,0 +1,55 @@
+from utils.security import verify_token
+from uuid import uuid4
+
+
+def login_session(client):
+    """Register a fresh user and return its session payload"""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"refresh-{uuid4().hex}@example.com", "password": "testpassword123"}
+    )
+    assert response.status_code == 200
+    return response.json()["session"]
+
+
+def refresh(client, refresh_token):
+    return client.post("/api/auth/refresh", json={"refreshToken": refresh_token})
+
+
+def test_refresh_rotates_tokens_and_detects_reuse(client):
+    """Test that a refresh token is single use and that replaying it revokes its successors"""
+    session = login_session(client)
+    assert session["refreshExpiresAt"] > session["expiresAt"]
+
+    response = refresh(client, session["refreshToken"])
+    assert response.status_code == 200
+    renewed = response.json()["session"]
+    assert renewed["refreshToken"] != session["refreshToken"]
+    headers = {"Authorization": f"Bearer {renewed['accessToken']}"}
+    assert client.get("/api/tasks/", headers=headers).status_code == 200
+
+    # Replaying the spent token fails and takes the rotated one down with it
+    assert refresh(client, session["refreshToken"]).status_code == 401
+    assert refresh(client, renewed["refreshToken"]).status_code == 401
+
+
+def test_logout_revokes_the_refresh_token(client):
+    """Test that a refresh token no longer works after logout"""
+    session = login_session(client)
+
+    assert client.post("/api/auth/logout", json={"refreshToken": session["refreshToken"]}).status_code == 200
+    assert refresh(client, session["refreshToken"]).status_code == 401
+
+    # Logging out without a body still succeeds
+    assert client.post("/api/auth/logout").status_code == 200
+
+
+def test_refresh_and_access_tokens_are_not_interchangeable(client):
+    """Test that a refresh token is rejected as a bearer token and vice versa"""
+    session = login_session(client)
+
+    assert verify_token(session["refreshToken"]) is None
+    headers = {"Authorization": f"Bearer {session['refreshToken']}"}
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
+    assert refresh(client, session["accessToken"]).status_code == 401
+    assert refresh(client, "not-a-token").status_code == 401
@@ -0,0 +1,630 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from config import settings
+from config.database import async_engine, async_session_factory
+from utils.negotiation import packb, prefers_msgpack, unpackb
+from utils.task_state import compact_tombstones
+from datetime import datetime, timedelta
+from uuid import uuid4
+import csv
+import io
+import json
+import pytest
+
+
+def register_and_get_headers(client):
+    """Register a fresh user and return its authorization headers"""
+    response = client.post(
+        "/api/auth/register",
+        json={
+            "email": f"tasks-{uuid4().hex}@example.com",
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 200
+    token = response.json()["session"]["accessToken"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements the async engine sends while the block runs"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_task_crud_flow(client):
+    """Test the full create/read/update/complete/delete cycle"""
+    headers = register_and_get_headers(client)
+
+    response = client.post("/api/tasks/", json={"title": "Write tests"}, headers=headers)
+    assert response.status_code == 200
+    task = response.json()
+    assert task["title"] == "Write tests"
+    assert task["completed"] is False
+
+    response = client.get(f"/api/tasks/{task['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == task["id"]
+
+    response = client.put(
+        f"/api/tasks/{task['id']}",
+        json={"description": "async edition"},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["description"] == "async edition"
+    assert response.json()["title"] == "Write tests"
+
+    response = client.patch(f"/api/tasks/{task['id']}/complete", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+
+    response = client.get("/api/tasks/", headers=headers)
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()] == [task["id"]]
+
+    response = client.delete(f"/api/tasks/{task['id']}", headers=headers)
+    assert response.status_code == 200
+
+    response = client.get(f"/api/tasks/{task['id']}", headers=headers)
+    assert response.status_code == 404
+
+
+def test_tasks_are_scoped_to_owner(client):
+    """Test that a user cannot read another user's task"""
+    owner_headers = register_and_get_headers(client)
+    other_headers = register_and_get_headers(client)
+
+    response = client.post("/api/tasks/", json={"title": "Private"}, headers=owner_headers)
+    task_id = response.json()["id"]
+
+    response = client.get(f"/api/tasks/{task_id}", headers=other_headers)
+    assert response.status_code == 404
+
+    response = client.delete(f"/api/tasks/{task_id}", headers=other_headers)
+    assert response.status_code == 404
+
+
+def test_cursor_pagination_walks_every_task_once(client):
+    """Test that following X-Next-Cursor visits each task exactly once, newest first"""
+    headers = register_and_get_headers(client)
+    created = [
+        client.post("/api/tasks/", json={"title": f"Task {i}"}, headers=headers).json()["id"]
+        for i in range(5)
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/tasks/", params=params, headers=headers)
+        assert response.status_code == 200
+        seen.extend(t["id"] for t in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+        # A task created mid-walk must not shift the remaining pages
+        client.post("/api/tasks/", json={"title": "Late arrival"}, headers=headers)
+
+    assert seen == list(reversed(created))
+
+
+def test_fast_read_path_matches_response_model(client):
+    """Test that the orjson read endpoints return exactly what TaskResponse would"""
+    headers = register_and_get_headers(client)
+    created = client.post(
+        "/api/tasks/", json={"title": "Same bytes", "description": "Ünïcode ✓"}, headers=headers
+    ).json()
+
+    listed = client.get("/api/tasks/", headers=headers)
+    assert listed.headers["content-type"] == "application/json"
+    assert listed.json() == [created]
+
+    single = client.get(f"/api/tasks/{created['id']}", headers=headers)
+    assert single.json() == created
+    assert "ETag" in single.headers
+
+    changes = client.get("/api/tasks/changes", headers=headers).json()
+    assert changes["tasks"] == [created]
+    assert changes["reset"] is False
+
+
+def test_msgpack_is_negotiated_for_requests_and_responses(client):
+    """Test msgpack bodies and Accept negotiation, with binary UUIDs/timestamps and separate ETags"""
+    assert prefers_msgpack("application/msgpack")
+    assert prefers_msgpack("application/x-msgpack, application/json")
+    assert not prefers_msgpack("application/json, application/msgpack;q=0.5")
+    assert not prefers_msgpack("*/*")
+
+    headers = register_and_get_headers(client)
+    msgpack_headers = {**headers, "Accept": "application/msgpack", "Content-Type": "application/msgpack"}
+
+    response = client.post("/api/tasks/", content=packb({"title": "Packed"}), headers=msgpack_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/msgpack"
+    created = unpackb(response.content)
+    as_json = client.get(f"/api/tasks/{created['id']}", headers=headers).json()
+    assert str(created["id"]) == as_json["id"]
+    assert created["created_at"].replace(tzinfo=None).isoformat() == as_json["created_at"]
+
+    response = client.get("/api/tasks/", headers=msgpack_headers)
+    assert unpackb(response.content) == [created]
+    assert "Accept" in response.headers["vary"]
+    json_etag = client.get("/api/tasks/", headers=headers).headers["etag"]
+    assert response.headers["etag"] != json_etag
+
+    response = client.get("/api/tasks/", headers={**msgpack_headers, "If-None-Match": response.headers["etag"]})
+    assert response.status_code == 304
+
+    response = client.post(
+        "/api/tasks/batch",
+        content=packb({"operations": [{"op": "complete", "id": created["id"]}]}),
+        headers=msgpack_headers
+    )
+    assert unpackb(response.content)["results"][0]["task"]["completed"] is True
+
+    response = client.post("/api/tasks/", content=b"\xc1", headers=msgpack_headers)
+    assert response.status_code == 400
+
+
+def test_invalid_cursor_is_rejected(client):
+    """Test that a malformed cursor returns 400"""
+    headers = register_and_get_headers(client)
+    response = client.get("/api/tasks/", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_batch_applies_operations_in_one_request(client):
+    """Test that a batch creates, updates, completes and deletes tasks with per-item results"""
+    headers = register_and_get_headers(client)
+    keep = client.post("/api/tasks/", json={"title": "Keep"}, headers=headers).json()
+    drop = client.post("/api/tasks/", json={"title": "Drop"}, headers=headers).json()
+
+    response = client.post(
+        "/api/tasks/batch",
+        json={"operations": [
+            {"op": "create", "title": "New"},
+            {"op": "create", "title": ""},
+            {"op": "update", "id": keep["id"], "description": "edited"},
+            {"op": "complete", "id": keep["id"]},
+            {"op": "delete", "id": drop["id"]},
+            {"op": "delete", "id": str(uuid4())},
+        ]},
+        headers=headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["status"] for r in body["results"]] == [201, 422, 200, 409, 200, 404]
+    assert body["succeeded"] == 3 and body["failed"] == 3
+    assert body["results"][0]["task"]["title"] == "New"
+    assert body["results"][2]["task"]["description"] == "edited"
+
+    titles = sorted(t["title"] for t in client.get("/api/tasks/", headers=headers).json())
+    assert titles == ["Keep", "New"]
+
+
+def test_batch_checks_ownership_under_the_state_lock(client):
+    """Test that ownership is read after the state row is locked, and a batch that fails entirely changes nothing"""
+    headers = register_and_get_headers(client)
+    task = client.post("/api/tasks/", json={"title": "Mine"}, headers=headers).json()
+    list_etag = client.get("/api/tasks/", headers=headers).headers["ETag"]
+
+    with count_queries() as statements:
+        response = client.post(
+            "/api/tasks/batch",
+            json={"operations": [
+                {"op": "delete", "id": str(uuid4())},
+                {"op": "update", "id": task["id"], "title": ""},
+            ]},
+            headers=headers
+        )
+    assert [r["status"] for r in response.json()["results"]] == [404, 422]
+    assert "usertaskstate" in statements[0] and statements[1].startswith("SELECT task.id")
+
+    response = client.get("/api/tasks/", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 304
+
+
+def test_batch_rejects_explicit_nulls_per_operation(client):
+    """Test that a null title or completed fails only its own operation, while a null description clears it"""
+    headers = register_and_get_headers(client)
+    first = client.post("/api/tasks/", json={"title": "First", "description": "old"}, headers=headers).json()
+    second = client.post("/api/tasks/", json={"title": "Second"}, headers=headers).json()
+    third = client.post("/api/tasks/", json={"title": "Third"}, headers=headers).json()
+
+    response = client.post(
+        "/api/tasks/batch",
+        json={"operations": [
+            {"op": "update", "id": first["id"], "description": None},
+            {"op": "update", "id": second["id"], "title": None},
+            {"op": "update", "id": third["id"], "completed": None},
+        ]},
+        headers=headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [200, 422, 422]
+    assert results[0]["task"]["description"] is None
+    assert results[1]["error"] == "Title cannot be null"
+    assert results[2]["error"] == "Completed cannot be null"
+
+
+def test_batch_toggles_and_sets_completion(client):
+    """Test that complete toggles without a value and sets it when given"""
+    headers = register_and_get_headers(client)
+    first = client.post("/api/tasks/", json={"title": "First"}, headers=headers).json()
+    second = client.post("/api/tasks/", json={"title": "Second"}, headers=headers).json()
+
+    response = client.post(
+        "/api/tasks/batch",
+        json={"operations": [
+            {"op": "complete", "id": first["id"]},
+            {"op": "complete", "id": second["id"], "completed": False},
+        ]},
+        headers=headers
+    )
+    results = response.json()["results"]
+    assert results[0]["task"]["completed"] is True
+    assert results[1]["task"]["completed"] is False
+
+
+def test_mutation_round_trips_do_not_regress(client):
+    """Test the statement count of each mutation: the task write plus its bookkeeping"""
+    headers = register_and_get_headers(client)
+    client.get("/api/auth/me", headers=headers)  # warm the principal cache
+    task_id = client.post("/api/tasks/", json={"title": "Count me"}, headers=headers).json()["id"]
+
+    # version bump, UPDATE ... RETURNING
+    with count_queries() as statements:
+        response = client.put(f"/api/tasks/{task_id}", json={"title": "Counted"}, headers=headers)
+    assert response.json()["title"] == "Counted"
+    assert len(statements) == 2 and statements[1].startswith("UPDATE task")
+
+    # version bump, UPDATE ... RETURNING, completed counter
+    with count_queries() as statements:
+        response = client.patch(f"/api/tasks/{task_id}/complete", headers=headers)
+    assert response.json()["completed"] is True
+    assert len(statements) == 3 and statements[1].startswith("UPDATE task")
+
+    # version bump, DELETE ... RETURNING, completed counter, tombstone
+    with count_queries() as statements:
+        response = client.delete(f"/api/tasks/{task_id}", headers=headers)
+    assert response.status_code == 200
+    assert len(statements) == 4 and statements[1].startswith("DELETE FROM task")
+
+    # version bump (rolled back), DELETE ... RETURNING
+    with count_queries() as statements:
+        response = client.delete(f"/api/tasks/{task_id}", headers=headers)
+    assert response.status_code == 404
+    assert len(statements) == 2
+
+
+def test_unchanged_task_list_is_not_modified(client):
+    """Test that list and item polls revalidate to 304 until a task changes"""
+    headers = register_and_get_headers(client)
+    client.get("/api/auth/me", headers=headers)  # warm the principal cache
+    task_id = client.post("/api/tasks/", json={"title": "Poll me"}, headers=headers).json()["id"]
+
+    response = client.get("/api/tasks/", headers=headers)
+    list_etag = response.headers["ETag"]
+    response = client.get(f"/api/tasks/{task_id}", headers=headers)
+    task_etag = response.headers["ETag"]
+
+    with count_queries() as statements:
+        response = client.get("/api/tasks/", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert len(statements) == 1
+
+    with count_queries() as statements:
+        response = client.get(f"/api/tasks/{task_id}", headers={**headers, "If-None-Match": task_etag})
+    assert response.status_code == 304
+    assert len(statements) == 1
+
+    client.patch(f"/api/tasks/{task_id}/complete", headers=headers)
+
+    response = client.get("/api/tasks/", headers={**headers, "If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != list_etag
+    response = client.get(f"/api/tasks/{task_id}", headers={**headers, "If-None-Match": task_etag})
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+
+
+def test_search_and_filters(client):
+    """Test full-text search, completion and date filters on the task list"""
+    headers = register_and_get_headers(client)
+    groceries = client.post(
+        "/api/tasks/", json={"title": "Buy groceries", "description": "milk and bread"}, headers=headers
+    ).json()
+    client.post("/api/tasks/", json={"title": "Call plumber"}, headers=headers)
+    client.patch(f"/api/tasks/{groceries['id']}/complete", headers=headers)
+
+    def titles(**params):
+        response = client.get("/api/tasks/", params=params, headers=headers)
+        assert response.status_code == 200
+        return sorted(t["title"] for t in response.json())
+
+    assert titles(q="grocer") == ["Buy groceries"]
+    assert titles(q="milk BREAD") == ["Buy groceries"]
+    assert titles(q="plumber milk") == []
+    assert titles(completed=False) == ["Call plumber"]
+    assert titles(completed=True, q="buy") == ["Buy groceries"]
+    assert titles(created_before=groceries["created_at"]) == []
+
+    # Offset bounds are compared in UTC: one hour before creation, written as +02:00
+    created = datetime.fromisoformat(groceries["created_at"])
+    an_hour_before = (created + timedelta(hours=1)).isoformat() + "+02:00"
+    assert titles(created_after=an_hour_before, q="grocer") == ["Buy groceries"]
+    assert titles(created_before=an_hour_before) == []
+
+    # Search follows edits and deletes
+    client.put(f"/api/tasks/{groceries['id']}", json={"title": "Buy flowers"}, headers=headers)
+    assert titles(q="groceries") == []
+    assert titles(q="flowers") == ["Buy flowers"]
+    client.delete(f"/api/tasks/{groceries['id']}", headers=headers)
+    assert titles(q="flowers") == []
+
+
+def test_sorted_cursor_pagination(client):
+    """Test that cursors page correctly under a non-default sort"""
+    headers = register_and_get_headers(client)
+    for title in ["delta", "alpha", "charlie", "bravo"]:
+        client.post("/api/tasks/", json={"title": title}, headers=headers)
+
+    seen = []
+    params = {"limit": 3, "sort": "title"}
+    while True:
+        response = client.get("/api/tasks/", params=params, headers=headers)
+        seen.extend(t["title"] for t in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    assert seen == ["alpha", "bravo", "charlie", "delta"]
+
+    # A cursor is bound to the sort it was issued for
+    response = client.get("/api/tasks/", params={"cursor": params["cursor"]}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_stats_follow_every_mutation(client):
+    """Test that the stats counters stay exact across single and batch writes"""
+    headers = register_and_get_headers(client)
+
+    def stats():
+        response = client.get("/api/tasks/stats", headers=headers)
+        assert response.status_code == 200
+        return response.json()
+
+    assert stats() == {"total": 0, "completed": 0, "open": 0}
+
+    first = client.post("/api/tasks/", json={"title": "One"}, headers=headers).json()
+    second = client.post("/api/tasks/", json={"title": "Two"}, headers=headers).json()
+    client.patch(f"/api/tasks/{first['id']}/complete", headers=headers)
+    assert stats() == {"total": 2, "completed": 1, "open": 1}
+
+    # Setting completed to its current value must not be counted twice
+    client.put(f"/api/tasks/{first['id']}", json={"completed": True}, headers=headers)
+    client.put(f"/api/tasks/{second['id']}", json={"completed": True}, headers=headers)
+    assert stats() == {"total": 2, "completed": 2, "open": 0}
+
+    client.delete(f"/api/tasks/{first['id']}", headers=headers)
+    assert stats() == {"total": 1, "completed": 1, "open": 0}
+
+    client.post(
+        "/api/tasks/batch",
+        json={"operations": [
+            {"op": "create", "title": "Three", "completed": True},
+            {"op": "create", "title": "Four"},
+            {"op": "complete", "id": second["id"], "completed": False},
+        ]},
+        headers=headers
+    )
+    assert stats() == {"total": 3, "completed": 1, "open": 2}
+
+    tasks = client.get("/api/tasks/", headers=headers).json()
+    client.post(
+        "/api/tasks/batch",
+        json={"operations": [{"op": "delete", "id": task["id"]} for task in tasks]},
+        headers=headers
+    )
+    assert stats() == {"total": 0, "completed": 0, "open": 0}
+
+
+def test_delta_sync_returns_only_changes_and_tombstones(client):
+    """Test that /changes reports writes and deletions after a cursor, and nothing else"""
+    headers = register_and_get_headers(client)
+    kept = client.post("/api/tasks/", json={"title": "Kept"}, headers=headers).json()
+    doomed = client.post("/api/tasks/", json={"title": "Doomed"}, headers=headers).json()
+
+    response = client.get("/api/tasks/changes", headers=headers)
+    assert response.status_code == 200
+    full = response.json()
+    assert sorted(t["title"] for t in full["tasks"]) == ["Doomed", "Kept"]
+    assert full["deleted"] == [] and full["has_more"] is False
+
+    response = client.get("/api/tasks/changes", params={"since": full["cursor"]}, headers=headers)
+    assert response.json()["tasks"] == [] and response.json()["deleted"] == []
+
+    client.patch(f"/api/tasks/{kept['id']}/complete", headers=headers)
+    client.delete(f"/api/tasks/{doomed['id']}", headers=headers)
+    added = client.post("/api/tasks/", json={"title": "Added"}, headers=headers).json()
+
+    delta = client.get("/api/tasks/changes", params={"since": full["cursor"]}, headers=headers).json()
+    assert [t["id"] for t in delta["tasks"]] == [kept["id"], added["id"]]
+    assert delta["tasks"][0]["completed"] is True
+    assert delta["deleted"] == [doomed["id"]]
+
+    response = client.get("/api/tasks/changes", params={"since": delta["cursor"]}, headers=headers)
+    assert response.json()["tasks"] == [] and response.json()["deleted"] == []
+
+
+def test_delta_sync_pages_split_large_versions(client, monkeypatch):
+    """Test that a batch larger than a page is paged by id, each change returned exactly once"""
+    monkeypatch.setattr(settings, "TASK_CHANGES_PAGE_SIZE", 2)
+    headers = register_and_get_headers(client)
+    client.post(
+        "/api/tasks/batch",
+        json={"operations": [{"op": "create", "title": f"Batch {i}"} for i in range(3)]},
+        headers=headers
+    )
+    client.post("/api/tasks/", json={"title": "Single 1"}, headers=headers)
+    client.post("/api/tasks/", json={"title": "Single 2"}, headers=headers)
+
+    pages = []
+    params = {}
+    while True:
+        body = client.get("/api/tasks/changes", params=params, headers=headers).json()
+        pages.append([t["title"] for t in body["tasks"]])
+        params["since"] = body["cursor"]
+        if not body["has_more"]:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    seen = [title for page in pages for title in page]
+    assert sorted(seen[:3]) == ["Batch 0", "Batch 1", "Batch 2"]
+    assert seen[3:] == ["Single 1", "Single 2"]
+
+    response = client.get("/api/tasks/changes", params=params, headers=headers)
+    assert response.json()["tasks"] == [] and response.json()["has_more"] is False
+
+
+def test_delta_sync_asks_for_reset_after_compaction(client):
+    """Test that a cursor older than the compacted tombstones gets reset instead of a partial delta"""
+    headers = register_and_get_headers(client)
+    task = client.post("/api/tasks/", json={"title": "Short-lived"}, headers=headers).json()
+    cursor = client.get("/api/tasks/changes", headers=headers).json()["cursor"]
+    client.delete(f"/api/tasks/{task['id']}", headers=headers)
+
+    async def compact():
+        async with async_session_factory() as session:
+            return await compact_tombstones(session, datetime.utcnow() + timedelta(seconds=1))
+
+    assert client.portal.call(compact) >= 1
+
+    response = client.get("/api/tasks/changes", params={"since": cursor}, headers=headers)
+    assert response.json()["reset"] is True
+
+
+def test_export_streams_every_task_as_ndjson_and_csv(client, monkeypatch):
+    """Test that the export returns all of a user's tasks, oldest first, across several cursor batches"""
+    monkeypatch.setattr(settings, "TASK_EXPORT_BATCH_SIZE", 2)
+    headers = register_and_get_headers(client)
+    description = 'Needs, "quoting"\nin CSV'
+    created = [
+        client.post("/api/tasks/", json={"title": f"Export {i}", "description": description}, headers=headers).json()
+        for i in range(5)
+    ]
+    client.patch(f"/api/tasks/{created[0]['id']}/complete", headers=headers)
+    created[0] = client.get(f"/api/tasks/{created[0]['id']}", headers=headers).json()
+
+    response = client.get("/api/tasks/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == created
+
+    response = client.get("/api/tasks/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    assert 'filename="tasks.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [task["id"] for task in created]
+    assert rows[0]["completed"] == "true" and rows[1]["completed"] == "false"
+    assert rows[0]["description"] == created[0]["description"]
+
+
+def test_import_inserts_valid_rows_in_chunks_and_reports_the_rest(client, monkeypatch):
+    """Test that an NDJSON import creates the valid rows, chunk by chunk, and lists each rejected row"""
+    monkeypatch.setattr(settings, "TASK_IMPORT_CHUNK_SIZE", 2)
+    headers = register_and_get_headers(client)
+    lines = [
+        json.dumps({"title": "Imported 1", "completed": True, "created_at": "2020-01-02T03:04:05Z"}),
+        json.dumps({"title": "Imported 2", "description": "from another app", "source": "ignored"}),
+        "",
+        json.dumps({"title": ""}),
+        "{not json",
+        json.dumps({"title": "Imported 3", "description": "x" * 1001}),
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"title": "Imported 4", "completed": "maybe"}),
+        json.dumps({"title": "Imported 5"}),
+    ]
+
+    def upload():
+        # Arrives in small pieces, splitting lines (and the multi-byte character) across chunks
+        last = json.dumps({"title": "Ünïcode"}, ensure_ascii=False)  # no trailing newline
+        body = ("\n".join(lines) + "\n" + last).encode("utf-8")
+        for start in range(0, len(body), 7):
+            yield body[start:start + 7]
+
+    with count_queries() as statements:
+        response = client.post("/api/tasks/import", content=upload(), headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["imported"] == 4 and body["failed"] == 5
+    assert [(e["row"], e["error"]) for e in body["errors"]] == [
+        (3, "Title must be between 1 and 200 characters"),
+        (4, "Row is not valid JSON"),
+        (5, "Description must not exceed 1000 characters"),
+        (6, "Row must be a JSON object"),
+        (7, "Completed must be true or false"),
+    ]
+    assert body["aborted"] is None
+    assert sum(s.lstrip().upper().startswith("INSERT INTO TASK ") for s in statements) == 2
+
+    tasks = {t["title"]: t for t in client.get("/api/tasks/", headers=headers).json()}
+    assert set(tasks) == {"Imported 1", "Imported 2", "Imported 5", "Ünïcode"}
+    assert tasks["Imported 1"]["completed"] is True
+    assert tasks["Imported 1"]["created_at"] == "2020-01-02T03:04:05"
+    assert tasks["Imported 2"]["description"] == "from another app"
+    assert client.get("/api/tasks/stats", headers=headers).json() == {"total": 4, "completed": 1, "open": 3}
+
+
+def test_import_accepts_an_export_csv(client):
+    """Test that a CSV export can be imported back, quoted multi-line fields included"""
+    source = register_and_get_headers(client)
+    client.post("/api/tasks/", json={"title": "Round, trip", "description": 'Two\n"lines"'}, headers=source)
+    done = client.post("/api/tasks/", json={"title": "Done"}, headers=source).json()
+    client.patch(f"/api/tasks/{done['id']}/complete", headers=source)
+    exported = client.get("/api/tasks/export", params={"format": "csv"}, headers=source).content
+
+    target = register_and_get_headers(client)
+    response = client.post("/api/tasks/import", params={"format": "csv"}, content=exported, headers=target)
+    assert response.json() == {"imported": 2, "failed": 0, "errors": [], "aborted": None}
+
+    copies = client.get("/api/tasks/", params={"sort": "title"}, headers=target).json()
+    originals = client.get("/api/tasks/", params={"sort": "title"}, headers=source).json()
+    for copy, original in zip(copies, originals):
+        for field in ("title", "description", "completed", "created_at"):
+            assert copy[field] == original[field]
+
+    response = client.post("/api/tasks/import", params={"format": "csv"}, content=b"name\nx\n", headers=target)
+    assert response.status_code == 422
+
+
+def test_login_returns_session_token(client):
+    """Test that login returns an access token for a registered user"""
+    email = f"login-{uuid4().hex}@example.com"
+    client.post("/api/auth/register", json={"email": email, "password": "testpassword123"})
+
+    response = client.post("/api/auth/login", json={"email": email, "password": "testpassword123"})
+    assert response.status_code == 200
+    assert response.json()["session"]["accessToken"]
+
+    response = client.post("/api/auth/login", json={"email": email, "password": "wrongpassword"})
+    assert response.status_code == 401
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,70 @@
+from sqlalchemy import delete, event
+from sqlmodel import Session
+from config.database import async_engine, engine
+from models.user import RefreshToken, User
+from uuid import UUID, uuid4
+import re
+
+
+def register(client):
+    """Register a fresh user and return (user id, session payload)"""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"token-{uuid4().hex}@example.com", "password": "testpassword123"}
+    )
+    assert response.status_code == 200
+    return UUID(response.json()["user"]["id"]), response.json()["session"]
+
+
+def bearer(session):
+    return {"Authorization": f"Bearer {session['accessToken']}"}
+
+
+def test_task_requests_do_not_query_the_user_table(client):
+    """Test that, once the token version is cached, task routes run no user-table statements"""
+    _, session = register(client)
+    headers = bearer(session)
+    assert client.get("/api/tasks/", headers=headers).status_code == 200
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        task = client.post("/api/tasks/", json={"title": "Token only"}, headers=headers).json()
+        assert client.get(f"/api/tasks/{task['id']}", headers=headers).status_code == 200
+        assert client.get("/api/tasks/", headers=headers).status_code == 200
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not [statement for statement in statements if re.search(r'\b(FROM|JOIN) "?user"?\b', statement)]
+
+
+def test_logout_all_revokes_access_and_refresh_tokens(client):
+    """Test that signing out everywhere rejects earlier access tokens on every route"""
+    _, session = register(client)
+    headers = bearer(session)
+    assert client.get("/api/tasks/", headers=headers).status_code == 200
+
+    assert client.post("/api/auth/logout-all", headers=headers).status_code == 200
+
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    assert client.post("/api/auth/refresh", json={"refreshToken": session["refreshToken"]}).status_code == 401
+
+
+def test_deleted_user_is_rejected(client):
+    """Test that a deleted user's still-valid token no longer authorizes task requests"""
+    user_id, session = register(client)
+    headers = bearer(session)
+    assert client.get("/api/tasks/", headers=headers).status_code == 200
+
+    with Session(engine) as db:
+        db.exec(delete(RefreshToken).where(RefreshToken.user_id == user_id))
+        db.delete(db.get(User, user_id))
+        db.commit()
+
+    assert client.get("/api/tasks/", headers=headers).status_code == 401
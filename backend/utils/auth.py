@@ -1,14 +1,49 @@
 from fastapi import HTTPException, status, Depends
-from sqlmodel import Session
+from sqlalchemy import event, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
 from models.user import User
-from config.database import get_session
+from schemas.auth import AuthenticatedUser
+from config import settings
+from config.database import get_async_session
 from uuid import UUID
-from utils.jwt import get_user_id_as_uuid, verify_and_decode_token
-from utils.security import verify_password
+from utils.jwt import get_token_payload, get_user_id_as_uuid, verify_and_decode_token
+from utils.cache import TTLCache
+from utils.hashing import verify_password_async
+from utils.refresh_tokens import revoke_user_refresh_tokens
+from utils.security import evict_user_tokens
 
+# Users resolved from token subjects, keyed by user id. Entries are detached from
+# their session and dropped whenever the user row is updated or deleted through the ORM.
+user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
 
-def authenticate_user(session: Session, email: str, password: str) -> Optional[User]:
+# Revocation store: current token version per user id, or USER_DELETED once the user is gone.
+# Dropped on every ORM change to the user; other workers see a revocation within the TTL.
+token_versions = TTLCache(maxsize=settings.TOKEN_VERSION_CACHE_SIZE, ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS)
+USER_DELETED = -1
+
+
+def invalidate_cached_user(user_id: UUID) -> None:
+    """
+    Drop a user from the principal cache and the revocation store
+    """
+    user_cache.pop(user_id)
+    token_versions.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_on_change(mapper, connection, target):
+    invalidate_cached_user(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _evict_tokens_on_delete(mapper, connection, target):
+    evict_user_tokens(target.id)
+
+
+async def authenticate_user(session: AsyncSession, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user by email and password
     """
@@ -16,9 +51,14 @@ def authenticate_user(session: Session, email: str, password: str) -> Optional[U
     if len(password) > 72:
         return None
 
-    user = session.query(User).filter(User.email == email).first()
+    result = await session.exec(select(User).where(User.email == email))
+    user = result.first()
+
+    if not user:
+        return None
 
-    if not user or not verify_password(password, user.hashed_password):
+    # bcrypt is CPU bound - run it on the dedicated hashing pool
+    if not await verify_password_async(password, user.hashed_password):
         return None
 
     return user
@@ -33,7 +73,11 @@ def get_current_user_from_token(credentials_dependency = Depends(get_user_id_as_
     return str(user_id)
 
 
-def get_current_user(session: Session = Depends(get_session), credentials_dependency = Depends(get_user_id_as_uuid)):
+async def get_current_user(
+    session: AsyncSession = Depends(get_async_session),
+    credentials_dependency = Depends(get_user_id_as_uuid),
+    payload: dict = Depends(get_token_payload),
+):
     """
     Get the current user by verifying the token and retrieving user info from DB
     """
@@ -45,11 +89,71 @@ def get_current_user(session: Session = Depends(get_session), credentials_depend
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # Find user by ID in the database
-    user = session.query(User).filter(User.id == user_id).first()
-
+    user = user_cache.get(user_id)
     if user is None:
-        # User exists in token but not in database - possibly deleted account
+        # Find user by ID in the database
+        user = await session.get(User, user_id)
+
+        if user is None:
+            # User exists in token but not in database - possibly deleted account
+            raise credentials_exception
+
+        # Detach so the cached instance is never expired or refreshed by another request's session
+        session.expunge(user)
+        user_cache.set(user_id, user)
+
+    if payload.get("ver", 0) != user.token_version:
+        # Issued before the user's tokens were revoked
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    return user
+
+
+async def get_token_version(session: AsyncSession, user_id: UUID) -> Optional[int]:
+    """
+    Current token version of a user from the revocation store (one primary-key lookup of a
+    single column on a miss), or None when the user no longer exists
+    """
+    version = token_versions.get(user_id)
+
+    if version is None:
+        result = await session.exec(select(User.token_version).where(User.id == user_id))
+        version = result.first()
+        if version is None:
+            version = USER_DELETED
+        token_versions.set(user_id, version)
+
+    return None if version == USER_DELETED else version
+
+
+async def get_token_user(
+    session: AsyncSession = Depends(get_async_session),
+    user_id: UUID = Depends(get_user_id_as_uuid),
+    payload: dict = Depends(get_token_payload),
+) -> AuthenticatedUser:
+    """
+    Authorize from the access token alone: the user row is never loaded, but tokens of
+    deleted users or older than the user's token version are rejected
+    """
+    if await get_token_version(session, user_id) != payload.get("ver", 0):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired authentication token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return AuthenticatedUser(id=user_id)
+
+
+async def revoke_user_tokens(session: AsyncSession, user_id: UUID) -> None:
+    """
+    Revoke every access and refresh token issued to a user (sign out everywhere)
+    """
+    await session.exec(
+        update(User).where(User.id == user_id).values(token_version=User.token_version + 1)
+    )
+    await revoke_user_refresh_tokens(session, user_id)
+    await session.commit()
+
+    # After the commit, so a concurrent lookup cannot cache the old version again
+    invalidate_cached_user(user_id)
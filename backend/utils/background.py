@@ -0,0 +1,22 @@
+"""
+Periodic maintenance jobs, run as background tasks of the app
+"""
+
+from typing import Any, Awaitable, Callable
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(job: Callable[[], Awaitable[Any]], interval: float, name: str) -> None:
+    """
+    Run job every interval seconds until cancelled. A failed run (database briefly
+    unavailable, lock timeout) is logged under name and retried on the next one.
+    """
+    while True:
+        try:
+            await job()
+        except Exception:
+            logger.exception("%s failed; retrying in %s seconds", name, interval)
+        await asyncio.sleep(interval)
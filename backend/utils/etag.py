@@ -0,0 +1,42 @@
+"""
+Strong ETags and If-None-Match handling for conditional GETs
+"""
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+import hashlib
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a quoted strong ETag from the given parts
+    """
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def task_etag(task_id: UUID, updated_at: datetime) -> str:
+    """
+    ETag of a single task - changes whenever the task is written
+    """
+    return make_etag("task", task_id, updated_at.isoformat())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires)
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
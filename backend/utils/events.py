@@ -0,0 +1,130 @@
+"""
+In-process pub/sub for the task change feed (Server-Sent Events)
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+import asyncio
+import json
+
+from config import settings
+
+# Sent to a subscriber that fell too far behind - the client should re-fetch its tasks
+RESYNC_EVENT = "resync"
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Encode one Server-Sent Events frame
+    """
+    payload = data if isinstance(data, str) else json.dumps(data, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """
+    A subscriber's bounded message queue on one channel
+    """
+
+    def __init__(self, backend: "InMemoryEventBackend", channel: str, queue_size: int):
+        self.backend = backend
+        self.channel = channel
+        self.queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, message: Optional[str]) -> None:
+        """
+        Queue a message without blocking the publisher; an overflowing queue is replaced by a resync
+        """
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_sse(RESYNC_EVENT, {}) if message is not None else None)
+
+    async def get(self) -> Optional[str]:
+        """
+        Wait for the next message (None once the backend is closed)
+        """
+        return await self.queue.get()
+
+    def get_nowait(self) -> Optional[str]:
+        return self.queue.get_nowait()
+
+    def close(self) -> None:
+        self.backend.unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class InMemoryEventBackend:
+    """
+    Fan-out to subscribers of the current process.
+
+    Another backend (e.g. Redis pub/sub for several workers) only needs the same
+    subscribe/unsubscribe/publish/close methods.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._channels: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.queue_size)
+        self._channels[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._channels.get(subscription.channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[subscription.channel]
+
+    async def publish(self, channel: str, message: str) -> None:
+        for subscription in list(self._channels.get(channel, ())):
+            subscription.deliver(message)
+
+    async def close(self) -> None:
+        """
+        End every open stream (used on shutdown)
+        """
+        for subscribers in list(self._channels.values()):
+            for subscription in list(subscribers):
+                subscription.deliver(None)
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._channels.values())
+
+
+class TaskEventBroker:
+    """
+    Publishes task changes to the owning user's channel; swap backend to fan out across workers
+    """
+
+    def __init__(self, backend: InMemoryEventBackend):
+        self.backend = backend
+
+    @staticmethod
+    def channel(user_id: UUID) -> str:
+        return f"tasks:{user_id}"
+
+    def subscribe(self, user_id: UUID) -> Subscription:
+        return self.backend.subscribe(self.channel(user_id))
+
+    async def publish(self, user_id: UUID, event: str, data: Any) -> None:
+        """
+        Encode the frame once and hand it to every subscriber of the user
+        """
+        await self.backend.publish(self.channel(user_id), format_sse(event, data))
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+task_events = TaskEventBroker(InMemoryEventBackend(queue_size=settings.SSE_QUEUE_SIZE))
@@ -0,0 +1,131 @@
+"""
+Bounded process pool for bcrypt work, isolated from the request threadpool
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException, status
+from typing import Any, Callable, Optional, Tuple
+import asyncio
+import multiprocessing
+import time
+
+from config import settings
+from utils.metrics import password_hash_duration, password_hash_wait
+from utils.security import get_password_hash, verify_password
+
+
+def timed_call(func: Callable[..., Any], *args: Any) -> Tuple[float, Any]:
+    """
+    Run func(*args) and return (seconds it took, result) - executed on the pool worker,
+    so the time excludes queueing
+    """
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+class PasswordHasher:
+    """
+    Runs password hashing in a dedicated, size-limited executor.
+
+    At most max_pending calls may be queued or running at once; further calls are
+    rejected immediately with 503 instead of piling up behind a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def start(self) -> None:
+        """
+        Create the executor (spawned processes, so no locks are inherited from the server)
+        """
+        if self._executor is not None:
+            return
+
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        else:
+            # HASH_WORKERS=0 keeps hashing in-process (tests, single-core hosts)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bcrypt")
+
+    def shutdown(self) -> None:
+        """
+        Stop the executor, cancelling queued work
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run func(*args) on the hashing executor, enforcing the queue limit and timeout
+        """
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        self.start()
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            submitted = time.perf_counter()
+            future = loop.run_in_executor(self._executor, timed_call, func, *args)
+            elapsed, result = await asyncio.wait_for(future, timeout=self.timeout)
+            password_hash_duration.observe(elapsed, func.__name__)
+            password_hash_wait.observe(max(time.perf_counter() - submitted - elapsed, 0.0), func.__name__)
+            return result
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service timed out, please retry",
+                headers={"Retry-After": "1"},
+            )
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        """
+        Queue depth and rejection counters
+        """
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.HASH_WORKERS,
+    max_pending=settings.HASH_MAX_PENDING,
+    timeout=settings.HASH_TIMEOUT_SECONDS,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the hashing pool
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the hashing pool
+    """
+    return await password_hasher.run(get_password_hash, password)
@@ -5,7 +5,6 @@ JWT Utilities for Better Auth token verification
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from typing import Optional
-from jose import JWTError
 from uuid import UUID
 
 from .security import verify_token
@@ -44,6 +43,13 @@ def verify_and_decode_token(token: str) -> dict:
     return payload
 
 
+def get_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)) -> dict:
+    """
+    Verify the bearer token and return its claims
+    """
+    return verify_and_decode_token(get_bearer_token(credentials))
+
+
 def get_user_id_from_token(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)) -> str:
     """
     Extract and return the user ID from the JWT token
@@ -0,0 +1,290 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Instrumentation stays cheap: a route wrapper (no extra routing), SQLAlchemy cursor events
+that add to a per-request tally, and lock-protected counters. Gauges that mirror state
+kept elsewhere (connection pools, the hashing pool) are read only when /metrics is scraped.
+"""
+
+from contextvars import ContextVar
+from fastapi.exceptions import RequestValidationError
+from sqlalchemy import event
+from starlette.exceptions import HTTPException
+from starlette.routing import BaseRoute
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import bisect
+import time
+
+# Latency buckets in seconds (requests, queries, bcrypt)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements per request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# [statements, seconds] spent on the database by the current request
+request_db_usage: ContextVar[Optional[List[float]]] = ContextVar("request_db_usage", default=None)
+
+
+def format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """
+    Render a label set as {a="x",b="y"}
+    """
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape_label(value: str) -> str:
+    """
+    Escape a label value for the text format
+    """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    """
+    Render a sample value, without a fraction when it is whole
+    """
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    """
+    Base class: a named family of samples keyed by label values
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.labels, key)} {format_value(value)}" for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    """
+    Value that goes up and down; optionally read from a callback at scrape time
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        collect: Optional[Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]] = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self.collect = collect
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def render(self) -> List[str]:
+        if self.collect is None:
+            return super().render()
+        return self.header() + [
+            f"{self.name}{format_labels(self.labels, key)} {format_value(value)}" for key, value in self.collect()
+        ]
+
+
+class Histogram(Metric):
+    """
+    Cumulative-bucket histogram of observed values
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(series)) for key, series in self._values.items()]
+
+        lines = self.header()
+        for key, series in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labels, key)} {format_value(series[-1])}")
+            lines.append(f"{self.name}_count{format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    The metrics exposed on /metrics, in registration order
+    """
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "Requests handled, by route template and status", ("method", "route", "status"),
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time from routing to the last response byte", ("method", "route"),
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled", ("method", "route"),
+))
+db_queries_per_request = registry.register(Histogram(
+    "db_queries_per_request", "SQL statements executed per request", ("method", "route"), QUERY_COUNT_BUCKETS,
+))
+db_time_per_request = registry.register(Histogram(
+    "db_query_seconds_per_request", "Time spent in SQL statements per request", ("method", "route"),
+))
+password_hash_duration = registry.register(Histogram(
+    "password_hash_seconds", "bcrypt time on the hashing pool, excluding queueing", ("operation",),
+))
+password_hash_wait = registry.register(Histogram(
+    "password_hash_queue_seconds", "Time a hash waited for a hashing pool worker", ("operation",),
+))
+
+
+def record_cursor_start(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    SQLAlchemy before_cursor_execute hook
+    """
+    if request_db_usage.get() is not None:
+        conn.info["metrics_started"] = time.perf_counter()
+
+
+def record_cursor_end(conn, cursor, statement, parameters, context, executemany) -> None:
+    """
+    SQLAlchemy after_cursor_execute hook: add the statement to the request's tally
+    """
+    usage = request_db_usage.get()
+    started = conn.info.pop("metrics_started", None)
+    if usage is not None and started is not None:
+        usage[0] += 1
+        usage[1] += time.perf_counter() - started
+
+
+def instrument_engine(engine) -> None:
+    """
+    Count statements and their time per request on a (sync or async-backing) engine
+    """
+    event.listen(engine, "before_cursor_execute", record_cursor_start)
+    event.listen(engine, "after_cursor_execute", record_cursor_end)
+
+
+def instrument_route(route: BaseRoute) -> None:
+    """
+    Wrap a route's ASGI app to record latency, status, in-flight count and DB usage under
+    the route template (so /api/tasks/{task_id} is one series, not one per task)
+    """
+    app = route.app
+    template = route.path
+
+    async def instrumented(scope, receive, send):
+        if scope["type"] != "http":
+            return await app(scope, receive, send)
+
+        method = scope["method"]
+        status = ["500"]
+        usage = [0, 0.0]
+        token = request_db_usage.set(usage)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        http_requests_in_flight.inc(method, template)
+        started = time.perf_counter()
+        try:
+            await app(scope, receive, send_wrapper)
+        except HTTPException as exc:
+            # Turned into a response by the exception middleware, outside the route
+            status[0] = str(exc.status_code)
+            raise
+        except RequestValidationError:
+            status[0] = "422"
+            raise
+        finally:
+            http_request_duration.observe(time.perf_counter() - started, method, template)
+            http_requests_in_flight.dec(method, template)
+            http_requests.inc(method, template, status[0])
+            db_queries_per_request.observe(usage[0], method, template)
+            db_time_per_request.observe(usage[1], method, template)
+            request_db_usage.reset(token)
+
+    route.app = instrumented
+
+
+def instrument_routes(routes: Iterable[BaseRoute]) -> None:
+    """
+    instrument_route for every route of an app
+    """
+    for route in routes:
+        if hasattr(route, "app") and hasattr(route, "path"):
+            instrument_route(route)
@@ -0,0 +1,225 @@
+"""
+MessagePack content negotiation for the task routes (JSON stays the default).
+
+UUIDs travel as a 16-byte extension type and timestamps as the standard msgpack
+timestamp extension, instead of 36- and 26-character strings.
+"""
+
+from contextvars import ContextVar
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+from typing import Any, Callable, Coroutine, Optional
+from datetime import datetime, timezone
+from uuid import UUID
+import msgpack
+import orjson
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack"}
+JSON_MEDIA_RANGES = {"application/json", "application/*", "*/*"}
+
+# Extension type code for UUIDs (16 raw bytes)
+UUID_EXT = 1
+
+EPOCH = datetime(1970, 1, 1)
+
+# Suffix distinguishing the msgpack representation's ETags from the JSON ones
+MSGPACK_ETAG_SUFFIX = "-mp"
+
+# Representation chosen for the current request, for handlers that encode their own responses
+response_format: ContextVar[str] = ContextVar("response_format", default="json")
+
+
+def encode_default(value: Any) -> Any:
+    """
+    msgpack hook for the types it cannot pack natively
+    """
+    if isinstance(value, UUID):
+        return msgpack.ExtType(UUID_EXT, value.bytes)
+    if isinstance(value, datetime):
+        # Task timestamps are naive UTC; plain arithmetic is several times cheaper than
+        # Timestamp.from_datetime
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = value - EPOCH
+        return msgpack.Timestamp(delta.days * 86400 + delta.seconds, delta.microseconds * 1000)
+    raise TypeError(f"Cannot serialize {type(value).__name__} to msgpack")
+
+
+def decode_ext(code: int, data: bytes) -> Any:
+    """
+    msgpack hook for the extension types this API sends
+    """
+    if code == UUID_EXT and len(data) == 16:
+        return UUID(bytes=data)
+    return msgpack.ExtType(code, data)
+
+
+def packb(content: Any) -> bytes:
+    """
+    Encode content as msgpack
+    """
+    return msgpack.packb(content, default=encode_default, use_bin_type=True)
+
+
+def unpackb(data: bytes) -> Any:
+    """
+    Decode msgpack produced by packb (timestamps come back as aware UTC datetimes)
+    """
+    return msgpack.unpackb(data, ext_hook=decode_ext, timestamp=3, raw=False)
+
+
+class MsgPackResponse(Response):
+    """
+    Response rendered with packb
+    """
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        return packb(content)
+
+
+def get_media_type(content_type: Optional[str]) -> str:
+    """
+    The bare media type of a Content-Type header, lowercased
+    """
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def prefers_msgpack(accept: Optional[str]) -> bool:
+    """
+    Whether an Accept header ranks msgpack at least as high as JSON (wildcards count as JSON)
+    """
+    if not accept:
+        return False
+
+    msgpack_q = json_q = 0.0
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type in JSON_MEDIA_RANGES:
+            json_q = max(json_q, q)
+
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def variant_etag(etag: str) -> str:
+    """
+    The ETag of the msgpack representation of a JSON response
+    """
+    weak, tag = ("W/", etag[2:]) if etag.startswith("W/") else ("", etag)
+    return f'{weak}{tag[:-1]}{MSGPACK_ETAG_SUFFIX}"'
+
+
+def strip_variant_etags(if_none_match: str) -> str:
+    """
+    Map msgpack ETags in an If-None-Match header back to the ones the handlers compute
+    """
+    return if_none_match.replace(f'{MSGPACK_ETAG_SUFFIX}"', '"')
+
+
+async def msgpack_request_as_json(request: Request) -> Request:
+    """
+    Re-issue a msgpack request as the equivalent JSON request, so body parsing and
+    validation stay FastAPI's
+    """
+    body = await request.body()
+    if not body:
+        return request
+
+    try:
+        body = orjson.dumps(unpackb(body))
+    except (ValueError, TypeError, msgpack.UnpackException):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Request body is not valid msgpack")
+
+    return replace_request(request, body, {b"content-type": b"application/json"})
+
+
+def replace_request(request: Request, body: bytes, headers: dict) -> Request:
+    """
+    Copy of a request with another body and some headers replaced
+    """
+    headers = {**headers, b"content-length": str(len(body)).encode("latin-1")}
+    scope = dict(request.scope)
+    scope["headers"] = [(name, value) for name, value in request.scope["headers"] if name not in headers]
+    scope["headers"] += list(headers.items())
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request(scope, receive)
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route that accepts msgpack request bodies and answers in msgpack when the Accept
+    header asks for it.
+
+    Handlers that encode their own responses check response_format; JSON responses
+    built from a response_model are re-encoded from the validated model, so UUIDs and
+    datetimes keep their binary encodings.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if get_media_type(request.headers.get("content-type")) in MSGPACK_MEDIA_TYPES:
+                request = await msgpack_request_as_json(request)
+
+            if not prefers_msgpack(request.headers.get("accept")):
+                response = await handler(request)
+                response.headers.append("Vary", "Accept")
+                return response
+
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match and MSGPACK_ETAG_SUFFIX in if_none_match:
+                headers = {b"if-none-match": strip_variant_etags(if_none_match).encode("latin-1")}
+                request = replace_request(request, await request.body(), headers)
+
+            token = response_format.set("msgpack")
+            try:
+                response = await handler(request)
+            finally:
+                response_format.reset(token)
+
+            if isinstance(response, JSONResponse):
+                response = self.to_msgpack(response)
+            if "etag" in response.headers:
+                response.headers["ETag"] = variant_etag(response.headers["etag"])
+            response.headers.append("Vary", "Accept")
+            return response
+
+        return negotiated_handler
+
+    def to_msgpack(self, response: JSONResponse) -> MsgPackResponse:
+        """
+        Re-encode a JSON response as msgpack, restoring UUID and datetime values through the
+        route's response_model when it has one
+        """
+        content = orjson.loads(response.body)
+        if self.response_field is not None:
+            validated, errors = self.response_field.validate(content, {}, loc=("response",))
+            if not errors:
+                content = self.response_field.serialize(validated, mode="python")
+
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name not in ("content-length", "content-type")
+        }
+        return MsgPackResponse(
+            content, status_code=response.status_code, headers=headers, background=response.background
+        )
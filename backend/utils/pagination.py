@@ -0,0 +1,68 @@
+"""
+Opaque keyset cursors for paging through tasks ordered by (sort column, id)
+"""
+
+from fastapi import HTTPException, status
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+from uuid import UUID
+import base64
+import binascii
+import json
+
+
+def encode_cursor(sort: str, value: Any, task_id: UUID) -> str:
+    """
+    Encode the sort key of the last row on a page as an opaque cursor
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    raw = json.dumps([sort, value, str(task_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, parse: Callable[[Any], Any] = lambda value: value) -> Tuple[Any, UUID]:
+    """
+    Decode a cursor produced by encode_cursor for the same sort, raising 400 if it was tampered with
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, task_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if cursor_sort != sort:
+            raise ValueError("cursor belongs to another sort order")
+        return parse(value), UUID(task_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def encode_change_cursor(change_seq: int, task_id: Optional[UUID] = None) -> str:
+    """
+    Encode a delta-sync position as an opaque cursor: after a whole version, or after
+    one task of a version that did not fit on the page
+    """
+    position = [change_seq] if task_id is None else [change_seq, str(task_id)]
+    raw = json.dumps(["changes", *position], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_change_cursor(cursor: str) -> Tuple[int, Optional[UUID]]:
+    """
+    Decode a cursor produced by encode_change_cursor, raising 400 if it was tampered with
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        kind, change_seq, *task_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if kind != "changes" or not isinstance(change_seq, int) or change_seq < 0:
+            raise ValueError("not a sync cursor")
+        if len(task_id) > 1 or not all(isinstance(value, str) for value in task_id):
+            raise ValueError("not a sync cursor")
+        return change_seq, UUID(task_id[0]) if task_id else None
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync cursor"
+        )
@@ -0,0 +1,125 @@
+"""
+Token-bucket admission control for the auth endpoints, checked before any bcrypt work
+"""
+
+from collections import OrderedDict
+from fastapi import HTTPException, Request, status
+from threading import Lock
+from typing import Callable, Optional
+import math
+import time
+
+from config import settings
+from utils.metrics import Counter, registry
+
+auth_rate_limited = registry.register(Counter(
+    "auth_rate_limited_total", "Auth requests rejected by the rate limiter", ("scope",),
+))
+
+
+class InMemoryBucketStore:
+    """
+    Token buckets kept in this process, least recently used dropped first beyond maxsize.
+
+    Any object with the same async take() can replace it (e.g. one backed by Redis) to
+    share the limits between workers.
+    """
+
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+    async def take(self, key: str, rate: float, capacity: float) -> float:
+        """
+        Take a token from the bucket (refilled at rate tokens per second, up to capacity).
+
+        Returns 0 when admitted, otherwise the seconds until a token will be available.
+        """
+        now = self._clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class AuthRateLimiter:
+    """
+    Per-client-IP and per-email token buckets for login and registration
+    """
+
+    def __init__(
+        self,
+        store: InMemoryBucketStore,
+        ip_per_minute: float,
+        ip_burst: float,
+        email_per_minute: float,
+        email_burst: float,
+        trust_proxy: bool = False,
+        enabled: bool = True,
+    ):
+        self.store = store
+        self.ip_rate = ip_per_minute / 60
+        self.ip_burst = ip_burst
+        self.email_rate = email_per_minute / 60
+        self.email_burst = email_burst
+        self.trust_proxy = trust_proxy
+        self.enabled = enabled
+
+    def client_ip(self, request: Request) -> str:
+        """
+        The caller's address; behind a trusted proxy, the last X-Forwarded-For hop (the one the
+        proxy added - earlier entries are client-controlled)
+        """
+        if self.trust_proxy:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.rsplit(",", 1)[-1].strip()
+        return request.client.host if request.client else "unknown"
+
+    async def check(self, request: Request, email: Optional[str] = None) -> None:
+        """
+        Admit the request or reject it with 429 and Retry-After
+        """
+        if not self.enabled:
+            return
+
+        buckets = [("ip", self.client_ip(request), self.ip_rate, self.ip_burst)]
+        if email:
+            buckets.append(("email", email.strip().lower(), self.email_rate, self.email_burst))
+
+        for scope, key, rate, burst in buckets:
+            wait = await self.store.take(f"{scope}:{key}", rate, burst)
+            if wait:
+                auth_rate_limited.inc(scope)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many authentication attempts, please retry later",
+                    headers={"Retry-After": str(math.ceil(wait))},
+                )
+
+
+auth_rate_limiter = AuthRateLimiter(
+    InMemoryBucketStore(maxsize=settings.AUTH_RATE_LIMIT_STORE_SIZE),
+    ip_per_minute=settings.AUTH_RATE_LIMIT_IP_PER_MINUTE,
+    ip_burst=settings.AUTH_RATE_LIMIT_IP_BURST,
+    email_per_minute=settings.AUTH_RATE_LIMIT_EMAIL_PER_MINUTE,
+    email_burst=settings.AUTH_RATE_LIMIT_EMAIL_BURST,
+    trust_proxy=settings.AUTH_RATE_LIMIT_TRUST_PROXY,
+    enabled=settings.AUTH_RATE_LIMIT_ENABLED,
+)
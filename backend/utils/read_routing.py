@@ -0,0 +1,26 @@
+"""
+Read-your-writes stickiness for replica reads: users who just wrote read from the primary
+"""
+
+from uuid import UUID
+
+from config import settings
+from utils.cache import TTLCache
+
+# Users with a write in the last DB_READ_YOUR_WRITES_SECONDS. Kept per process, so a client
+# whose requests are spread over several workers only gets the guarantee on the one it wrote to.
+recent_writers = TTLCache(maxsize=settings.DB_READ_YOUR_WRITES_CACHE_SIZE, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def mark_user_write(user_id: UUID) -> None:
+    """
+    Pin the user's reads to the primary for the read-your-writes window
+    """
+    recent_writers.set(user_id, True)
+
+
+def wrote_recently(user_id: UUID) -> bool:
+    """
+    Whether the user wrote within the read-your-writes window
+    """
+    return recent_writers.get(user_id) is not None
@@ -0,0 +1,120 @@
+"""
+Rotating refresh tokens: signed JWTs whose jti keys a database row, so renewing a
+session costs a signature check and a primary-key update instead of a bcrypt login
+"""
+
+from sqlalchemy import delete, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
+
+from config import settings
+from config.database import async_session_factory
+from models.user import RefreshToken
+from utils.security import create_refresh_token, decode_refresh_token
+
+REFRESH_TOKEN_EXPIRES = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+
+def issue_refresh_token(session: AsyncSession, user_id: UUID, family_id: Optional[UUID] = None) -> str:
+    """
+    Add a new refresh token row to the session (committed by the caller) and return
+    the signed token; a new family is started unless one is given
+    """
+    token_id = uuid4()
+    family_id = family_id or token_id
+    session.add(RefreshToken(
+        id=token_id,
+        user_id=user_id,
+        family_id=family_id,
+        expires_at=datetime.utcnow() + REFRESH_TOKEN_EXPIRES,
+    ))
+    return create_refresh_token(user_id, token_id, family_id, REFRESH_TOKEN_EXPIRES)
+
+
+async def revoke_refresh_family(session: AsyncSession, family_id: UUID) -> None:
+    """
+    Revoke every live token of a family
+    """
+    await session.exec(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+async def revoke_user_refresh_tokens(session: AsyncSession, user_id: UUID) -> None:
+    """
+    Revoke every live refresh token of a user
+    """
+    await session.exec(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+async def rotate_refresh_token(session: AsyncSession, token: str) -> Optional[Tuple[UUID, str]]:
+    """
+    Spend a refresh token and return (user id, its replacement), or None when the token is
+    invalid, expired or already spent.
+
+    Presenting a spent token means it leaked (or two clients raced for it), so the whole
+    family is revoked and the legitimate holder has to log in again.
+    """
+    claims = decode_refresh_token(token)
+    if claims is None:
+        return None
+
+    user_id, token_id, family_id = claims["sub"], claims["jti"], claims["fam"]
+
+    # A single conditional update both checks and spends the token, so concurrent
+    # refreshes of the same token cannot both succeed
+    result = await session.exec(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == token_id,
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        await revoke_refresh_family(session, family_id)
+        await session.commit()
+        return None
+
+    replacement = issue_refresh_token(session, user_id, family_id)
+    await session.commit()
+    return user_id, replacement
+
+
+async def revoke_refresh_token(session: AsyncSession, token: str) -> bool:
+    """
+    Revoke the family of a refresh token (logout); False when the token is not valid
+    """
+    claims = decode_refresh_token(token)
+    if claims is None:
+        return False
+
+    await revoke_refresh_family(session, claims["fam"])
+    await session.commit()
+    return True
+
+
+async def prune_refresh_tokens(session: AsyncSession, cutoff: datetime) -> int:
+    """
+    Delete tokens that expired before cutoff (their signatures are rejected anyway)
+    """
+    result = await session.exec(delete(RefreshToken).where(RefreshToken.expires_at < cutoff))
+    await session.commit()
+    return result.rowcount
+
+
+async def prune_expired_refresh_tokens() -> int:
+    """
+    One pruning pass in its own session, deleting tokens that have already expired
+    """
+    async with async_session_factory() as session:
+        return await prune_refresh_tokens(session, datetime.utcnow())
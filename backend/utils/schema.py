@@ -0,0 +1,113 @@
+"""
+Startup schema check: one query for the recorded migration revision instead of running
+DDL on every boot. Alembic is only imported when the database actually needs migrating.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from typing import Optional
+import os
+
+from config import settings
+
+# Alembic head this code runs against - test_migrations checks it matches migrations/
+SCHEMA_REVISION = "0009_change_seq_id_indexes"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# pg_advisory_xact_lock key serializing startup migrations across workers
+MIGRATION_LOCK_KEY = 0x7461736B  # "task"
+
+
+class SchemaVersionError(RuntimeError):
+    """
+    The database is not at the schema revision this code expects
+    """
+
+
+def get_alembic_config(url: str, connection=None):
+    """
+    Alembic configuration for a database URL, optionally bound to an open connection
+    """
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def get_schema_revision(engine: Engine) -> Optional[str]:
+    """
+    Revision recorded in alembic_version, or None for a database without migration history
+    """
+    with engine.connect() as connection:
+        try:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except DBAPIError:
+            return None
+
+
+def lock_for_migration(connection: Connection) -> None:
+    """
+    Take a database-wide lock held until the connection's transaction ends, so workers
+    starting together migrate one at a time
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    elif dialect == "sqlite":
+        # The driver begins transactions lazily; take the write lock up front instead
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Apply pending migrations through the application's own engine, under the migration lock.
+
+    The revision is read again once the lock is held: another worker may have migrated
+    meanwhile, in which case there is nothing left to do.
+    """
+    with engine.begin() as connection:
+        lock_for_migration(connection)
+        revision = None
+        if inspect(connection).has_table("alembic_version"):
+            revision = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        if revision == SCHEMA_REVISION:
+            return
+
+        from alembic import command
+
+        url = engine.url.render_as_string(hide_password=False)
+        command.upgrade(get_alembic_config(url, connection), "head")
+
+
+def ensure_schema(engine: Engine, mode: str = settings.DB_SCHEMA_CHECK) -> Optional[str]:
+    """
+    Check that the database is at SCHEMA_REVISION before serving.
+
+    "upgrade" migrates an empty or outdated database, "verify" refuses to start instead,
+    and "off" skips the check. Returns the revision the database is at.
+
+    Tables built by create_all before migrations existed have no revision; the first
+    migration adopts them, so they are upgraded like any other outdated database.
+    """
+    if mode == "off":
+        return None
+
+    revision = get_schema_revision(engine)
+    if revision == SCHEMA_REVISION:
+        return revision
+
+    if mode != "upgrade":
+        raise SchemaVersionError(
+            f"Database schema is at {revision or 'no revision'}, expected {SCHEMA_REVISION}. "
+            "Run `alembic upgrade head`."
+        )
+
+    upgrade_schema(engine)
+    return SCHEMA_REVISION
@@ -0,0 +1,45 @@
+"""
+Full-text task search: FTS5 on SQLite, tsvector/GIN on Postgres
+"""
+
+from sqlalchemy import and_, or_, text
+from sqlalchemy.sql.elements import ColumnElement
+import re
+
+from models.todo import Task
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def get_search_terms(query: str) -> list:
+    """
+    Split a free-text query into plain word tokens (operators and punctuation are dropped)
+    """
+    return _WORD.findall(query.lower())
+
+
+def task_search_clause(dialect: str, query: str) -> ColumnElement:
+    """
+    WHERE clause matching tasks whose title or description contains every term (as a prefix)
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        # Nothing searchable (e.g. only punctuation) - match nothing rather than everything
+        return text("1 = 0")
+
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        return text(
+            "task.rowid IN (SELECT rowid FROM task_fts WHERE task_fts MATCH :task_search)"
+        ).bindparams(task_search=match)
+
+    if dialect == "postgresql":
+        match = " & ".join(f"{term}:*" for term in terms)
+        return text(
+            "task.search_vector @@ to_tsquery('simple', :task_search)"
+        ).bindparams(task_search=match)
+
+    # No index on other backends - fall back to a case-insensitive scan
+    return and_(
+        *[or_(Task.title.ilike(f"%{term}%"), Task.description.ilike(f"%{term}%")) for term in terms]
+    )
@@ -1,39 +1,72 @@
-from typing import Optional
-from jose import JWTError, jwt
-from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Optional, Union
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
+from uuid import UUID
 
-# Load environment variables
-load_dotenv()
+from config import settings
+from utils.cache import TTLCache
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib and python-jose are imported on first use, keeping them off the cold-start path
+# (and out of the hashing pool's worker processes, which only need passlib)
 
 # JWT settings - using BETTER_AUTH_SECRET for verification only
 SECRET_KEY = os.getenv("BETTER_AUTH_SECRET") or os.getenv("SECRET_KEY", "your-default-secret-key-change-this")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
+# "typ" claim that marks a refresh token (access tokens carry none)
+REFRESH_TOKEN_TYPE = "refresh"
+
+# Payloads of tokens that already passed signature verification, keyed by a digest of the
+# token. Each entry lives no longer than its token's exp claim.
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+
+
+@lru_cache(maxsize=None)
+def get_password_context():
+    """
+    Password hashing context, built on first use
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Hash a password using bcrypt
     """
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
+
+
+def get_token_cache_key(token: str) -> bytes:
+    """
+    Digest used to key a token in the verified-token cache (raw tokens are never stored)
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 def verify_token(token: str) -> Optional[dict]:
     """
     Verify a JWT token and return the payload if valid
     """
+    cache_key = get_token_cache_key(token)
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        # Already verified - skip the HMAC check and claim parsing
+        return payload
+
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -41,6 +74,14 @@ def verify_token(token: str) -> Optional[dict]:
         if user_id is None:
             return None
 
+        if payload.get("typ") == REFRESH_TOKEN_TYPE:
+            # Refresh tokens only buy new access tokens at /api/auth/refresh
+            return None
+
+        expires_at = payload.get("exp")
+        ttl = expires_at - time.time() if isinstance(expires_at, (int, float)) else None
+        token_cache.set(cache_key, payload, ttl=ttl)
+
         return payload
 
     except JWTError:
@@ -51,10 +92,27 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
+def revoke_token(token: str) -> None:
+    """
+    Evict a token from the verified-token cache so its next use is fully re-verified
+    """
+    token_cache.pop(get_token_cache_key(token))
+
+
+def evict_user_tokens(user_id: Union[str, UUID]) -> int:
+    """
+    Evict every cached token issued to a user
+    """
+    subject = str(user_id)
+    return token_cache.evict_where(lambda key, payload: payload.get("sub") == subject)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """
     Create a JWT access token
     """
+    from jose import jwt
+
     to_encode = data.copy()
 
     if expires_delta:
@@ -65,4 +123,41 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+def create_refresh_token(user_id: UUID, token_id: UUID, family_id: UUID, expires_delta: timedelta) -> str:
+    """
+    Create a signed refresh token; its jti is the key of the token's database row
+    """
+    from jose import jwt
+
+    claims = {
+        "sub": str(user_id),
+        "jti": str(token_id),
+        "fam": str(family_id),
+        "typ": REFRESH_TOKEN_TYPE,
+        "exp": datetime.utcnow() + expires_delta,
+    }
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def decode_refresh_token(token: str) -> Optional[dict]:
+    """
+    Verify a refresh token's signature and expiry, returning its claims with the
+    sub, jti and fam identifiers parsed as UUIDs
+    """
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("typ") != REFRESH_TOKEN_TYPE:
+            return None
+        return {
+            **payload,
+            "sub": UUID(payload["sub"]),
+            "jti": UUID(payload["jti"]),
+            "fam": UUID(payload["fam"]),
+        }
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,81 @@
+"""
+Fast path for task read responses: only the response columns, plain dicts, orjson encoding.
+Also the NDJSON and CSV encoders used by the task export.
+"""
+
+from fastapi.responses import ORJSONResponse, Response
+from typing import Any, Dict, Iterable, Mapping, Optional
+from datetime import datetime
+import csv
+import io
+import orjson
+
+from models.todo import Task
+from utils.negotiation import MsgPackResponse, response_format
+
+# The TaskResponse fields, in the same order, so both paths produce identical JSON
+TASK_RESPONSE_COLUMNS = (
+    Task.title,
+    Task.description,
+    Task.completed,
+    Task.id,
+    Task.user_id,
+    Task.created_at,
+    Task.updated_at,
+)
+TASK_RESPONSE_KEYS = tuple(column.key for column in TASK_RESPONSE_COLUMNS)
+
+
+def task_row(row: Any) -> Dict[str, Any]:
+    """
+    Turn a row selected with TASK_RESPONSE_COLUMNS (plus any trailing extras, which are
+    dropped) into a TaskResponse-shaped dict
+    """
+    return dict(zip(TASK_RESPONSE_KEYS, row))
+
+
+def task_rows(rows: Iterable[Any]) -> list:
+    """
+    task_row for every row of a result
+    """
+    return [dict(zip(TASK_RESPONSE_KEYS, row)) for row in rows]
+
+
+def json_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Encode already-shaped content with orjson (UUIDs and datetimes natively), skipping
+    response_model validation - or as msgpack when the request negotiated it
+    """
+    response_class = MsgPackResponse if response_format.get() == "msgpack" else ORJSONResponse
+    return response_class(content, headers=dict(headers) if headers else None)
+
+
+def encode_ndjson(rows: Iterable[Any]) -> bytes:
+    """
+    One JSON object per line for each row selected with TASK_RESPONSE_COLUMNS
+    """
+    return b"".join(orjson.dumps(task_row(row)) + b"\n" for row in rows)
+
+
+def csv_value(value: Any) -> Any:
+    """
+    Spell a column value the way the JSON responses do (true/false, ISO 8601 timestamps)
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(rows: Iterable[Any], header: bool = False) -> bytes:
+    """
+    CSV lines (optionally preceded by the header line) for rows selected with TASK_RESPONSE_COLUMNS
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(TASK_RESPONSE_KEYS)
+    for row in rows:
+        writer.writerow(csv_value(value) for value in row[:len(TASK_RESPONSE_KEYS)])
+    return buffer.getvalue().encode("utf-8")
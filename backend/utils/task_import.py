@@ -0,0 +1,168 @@
+"""
+Incremental NDJSON/CSV parsing for the task import: records are produced as the upload
+arrives, so only the current line (or quoted CSV record) is ever held in memory
+"""
+
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from datetime import datetime, timezone
+import codecs
+import csv
+import orjson
+
+from config import settings
+
+TRUE_VALUES = {"true", "1", "yes", "y", "t"}
+FALSE_VALUES = {"false", "0", "no", "n", "f", ""}
+
+
+class ImportFormatError(ValueError):
+    """
+    The upload cannot be parsed any further (no usable header, a runaway line)
+    """
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split an upload into text lines (without the line break), decoding UTF-8 across chunk borders
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+        if len(pending) > settings.TASK_IMPORT_MAX_LINE_LENGTH:
+            raise ImportFormatError(f"Lines may not exceed {settings.TASK_IMPORT_MAX_LINE_LENGTH} characters")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (row number, record) for every non-blank line; a line that is not a JSON object
+    yields its error message instead
+    """
+    row = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+
+        row += 1
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield row, "Row is not valid JSON"
+            continue
+        yield row, record if isinstance(record, dict) else "Row must be a JSON object"
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (row number, record) for every data row after the header line.
+
+    A quoted field may span lines: lines are joined until the record's quotes balance,
+    which holds for any RFC 4180 record since embedded quotes are doubled.
+    """
+    header = None
+    record = ""
+    row = 0
+
+    async for line in iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            if len(record) > settings.TASK_IMPORT_MAX_LINE_LENGTH:
+                raise ImportFormatError(f"Records may not exceed {settings.TASK_IMPORT_MAX_LINE_LENGTH} characters")
+            continue
+
+        text, record = record, ""
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            if "title" not in header:
+                raise ImportFormatError("CSV header must include a title column")
+            continue
+
+        row += 1
+        if len(values) > len(header):
+            yield row, "Row has more fields than the header"
+            continue
+        yield row, dict(zip(header, values))
+
+    if record:
+        yield row + 1, "Row ends inside a quoted field"
+
+
+def parse_bool(value: Any) -> Optional[bool]:
+    """
+    Read a completed flag from JSON (true/false) or CSV text, None if it is not a boolean
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in TRUE_VALUES | FALSE_VALUES:
+        return value.strip().lower() in TRUE_VALUES
+    return None
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """
+    Convert a timestamp to naive UTC, the way task timestamps are stored (naive ones are taken as UTC)
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Read an ISO 8601 timestamp as naive UTC (the way task timestamps are stored), None if invalid
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return to_naive_utc(parsed)
+
+
+def get_import_fields(record: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Pick title, description, completed and created_at out of an import record.
+
+    Returns the column values, or the error message for the row. Other keys (id, user_id,
+    updated_at from an export) are ignored.
+    """
+    title = record.get("title")
+    if not isinstance(title, str):
+        return None, "Title is required"
+
+    description = record.get("description")
+    if description == "":
+        description = None
+    if description is not None and not isinstance(description, str):
+        return None, "Description must be a string"
+
+    completed = False if record.get("completed") is None else parse_bool(record["completed"])
+    if completed is None:
+        return None, "Completed must be true or false"
+
+    created_at = None
+    if record.get("created_at") not in (None, ""):
+        created_at = parse_timestamp(record["created_at"])
+        if created_at is None:
+            return None, "created_at must be an ISO 8601 timestamp"
+
+    return {
+        "title": title,
+        "description": description,
+        "completed": completed,
+        "created_at": created_at,
+    }, None
@@ -0,0 +1,169 @@
+"""
+Per-user task state row, bumped in the same transaction as every task write
+"""
+
+from sqlalchemy import delete, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
+
+from config.database import async_session_factory
+from models.todo import TaskStats, TaskTombstone, UserTaskState
+from utils.read_routing import mark_user_write
+
+
+async def bump_task_state(
+    session: AsyncSession,
+    user_id: UUID,
+    task_delta: int = 0,
+    completed_delta: int = 0,
+) -> int:
+    """
+    Advance the user's task change marker and apply counter deltas in one statement
+    (creating the row on the user's first write), returning the new version.
+
+    The row stays locked until commit, so writes of one user are serialized and the
+    returned version - stamped on the written tasks as change_seq - follows commit order.
+
+    Every task write passes through here, so it also starts the user's read-your-writes window.
+    """
+    mark_user_write(user_id)
+    now = datetime.utcnow()
+    dialect = session.bind.dialect.name
+    changes = {
+        "version": UserTaskState.version + 1,
+        "task_count": UserTaskState.task_count + task_delta,
+        "completed_count": UserTaskState.completed_count + completed_delta,
+        "updated_at": now,
+    }
+    first_row = UserTaskState(
+        user_id=user_id,
+        version=1,
+        task_count=task_delta,
+        completed_count=completed_delta,
+        updated_at=now,
+    )
+
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        statement = (
+            insert(UserTaskState)
+            .values(**first_row.model_dump())
+            .on_conflict_do_update(index_elements=[UserTaskState.user_id], set_=changes)
+            .returning(UserTaskState.version)
+        )
+        result = await session.exec(statement)
+        return result.scalar_one()
+
+    # Other backends: update, then insert if the row did not exist yet
+    result = await session.exec(
+        update(UserTaskState).where(UserTaskState.user_id == user_id).values(**changes)
+    )
+    if result.rowcount == 0:
+        session.add(first_row)
+        await session.flush()
+    return await get_task_state_version(session, user_id)
+
+
+async def adjust_task_counters(
+    session: AsyncSession,
+    user_id: UUID,
+    task_delta: int = 0,
+    completed_delta: int = 0,
+) -> None:
+    """
+    Apply counter deltas learned after the marker was bumped (no-op when both are zero)
+    """
+    if not task_delta and not completed_delta:
+        return
+
+    await session.exec(
+        update(UserTaskState)
+        .where(UserTaskState.user_id == user_id)
+        .values(
+            task_count=UserTaskState.task_count + task_delta,
+            completed_count=UserTaskState.completed_count + completed_delta,
+        )
+    )
+
+
+async def record_tombstones(session: AsyncSession, user_id: UUID, task_ids: List[UUID], change_seq: int) -> None:
+    """
+    Remember deleted tasks so delta sync can report them
+    """
+    if not task_ids:
+        return
+
+    now = datetime.utcnow()
+    await session.exec(
+        insert(TaskTombstone),
+        params=[
+            {"task_id": task_id, "user_id": user_id, "change_seq": change_seq, "deleted_at": now}
+            for task_id in task_ids
+        ],
+    )
+
+
+async def compact_tombstones(session: AsyncSession, cutoff: datetime) -> int:
+    """
+    Drop tombstones deleted before cutoff, raising each affected user's tombstone floor
+    so clients syncing from before it are told to reset
+    """
+    expired = select(TaskTombstone.user_id).where(TaskTombstone.deleted_at < cutoff)
+    newest_expired = (
+        select(func.max(TaskTombstone.change_seq))
+        .where(TaskTombstone.user_id == UserTaskState.user_id, TaskTombstone.deleted_at < cutoff)
+        .scalar_subquery()
+    )
+    await session.exec(
+        update(UserTaskState)
+        .where(UserTaskState.user_id.in_(expired))
+        .values(tombstone_floor=newest_expired)
+    )
+    result = await session.exec(delete(TaskTombstone).where(TaskTombstone.deleted_at < cutoff))
+    await session.commit()
+    return result.rowcount
+
+
+async def compact_expired_tombstones(retention: timedelta) -> int:
+    """
+    One compaction pass in its own session, dropping tombstones older than the retention window
+    """
+    async with async_session_factory() as session:
+        return await compact_tombstones(session, datetime.utcnow() - retention)
+
+
+async def get_task_state_version(session: AsyncSession, user_id: UUID) -> int:
+    """
+    Current change marker of the user's tasks (0 before their first write)
+    """
+    result = await session.exec(
+        select(UserTaskState.version).where(UserTaskState.user_id == user_id)
+    )
+    return result.first() or 0
+
+
+async def get_tombstone_floor(session: AsyncSession, user_id: UUID) -> int:
+    """
+    Highest change_seq whose tombstones may already be compacted away
+    """
+    result = await session.exec(
+        select(UserTaskState.tombstone_floor).where(UserTaskState.user_id == user_id)
+    )
+    return result.first() or 0
+
+
+async def get_task_stats_for_user(session: AsyncSession, user_id: UUID) -> TaskStats:
+    """
+    Read the user's task counters (all zero before their first write)
+    """
+    result = await session.exec(
+        select(UserTaskState.task_count, UserTaskState.completed_count)
+        .where(UserTaskState.user_id == user_id)
+    )
+    row = result.first()
+    total, completed = row if row is not None else (0, 0)
+    return TaskStats(total=total, completed=completed, open=total - completed)